@@ -0,0 +1,65 @@
+import json
+import os
+
+from build_manifest import hash_file
+
+FINGERPRINT_LENGTH = 8
+ASSET_MANIFEST_NAME = "asset-manifest.json"
+HASH_CACHE_VERSION = 1
+
+
+def fingerprint_path(rel_path, digest):
+    root, ext = os.path.splitext(rel_path)
+    return f"{root}.{digest[:FINGERPRINT_LENGTH]}{ext}"
+
+def asset_url(rel_path):
+    return "/" + rel_path.replace(os.sep, "/")
+
+def load_asset_manifest(path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+def write_asset_manifest(path, assets):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(assets, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+class AssetHashCache:
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = {}
+
+    @classmethod
+    def load(cls, path):
+        cache = cls(path)
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cache
+        if data.get("version") == HASH_CACHE_VERSION:
+            cache.entries = data.get("entries", {})
+        return cache
+
+    def save(self):
+        if self.path is None:
+            raise ValueError("hash cache path is not set")
+        cache_dir = os.path.dirname(self.path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": HASH_CACHE_VERSION, "entries": self.entries}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def hash(self, path, st=None):
+        if st is None:
+            st = os.stat(path)
+        entry = self.entries.get(path)
+        if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+            return entry[2]
+        digest = hash_file(path)
+        self.entries[path] = [st.st_size, st.st_mtime_ns, digest]
+        return digest
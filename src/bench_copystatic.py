@@ -0,0 +1,61 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from copystatic import copy_static
+
+
+def make_tree(root, small_files, large_files, large_size):
+    for i in range(small_files):
+        directory = os.path.join(root, f"dir{i % 100}")
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"file{i}.css"), "wb") as f:
+            f.write(os.urandom(512))
+    images = os.path.join(root, "images")
+    os.makedirs(images, exist_ok=True)
+    for i in range(large_files):
+        with open(os.path.join(images, f"image{i}.png"), "wb") as f:
+            f.write(os.urandom(large_size))
+
+
+def serial_shutil_copy(source, destination):
+    for dirpath, _, filenames in os.walk(source):
+        dest_dir = os.path.join(destination, os.path.relpath(dirpath, source))
+        os.makedirs(dest_dir, exist_ok=True)
+        for name in filenames:
+            shutil.copy(os.path.join(dirpath, name), os.path.join(dest_dir, name))
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    small_files = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    large_files = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    large_size = 32 * 1024 * 1024
+    with tempfile.TemporaryDirectory() as root:
+        source = os.path.join(root, "static")
+        make_tree(source, small_files, large_files, large_size)
+        print(f"{small_files} small files, {large_files} x {large_size // 2**20} MB images")
+
+        for run in ("warm-up", "serial shutil.copy"):
+            dest = os.path.join(root, "serial")
+            elapsed = timed(serial_shutil_copy, source, dest)
+            if run != "warm-up":
+                print(f"  {run}  {elapsed:7.2f} s")
+            shutil.rmtree(dest)
+
+        for mode in ("copy", "reflink", "hardlink"):
+            dest = os.path.join(root, mode)
+            elapsed = timed(copy_static, source, dest, mode=mode)
+            print(f"  copy_static {mode:<8} {elapsed:7.2f} s")
+            shutil.rmtree(dest)
+
+
+if __name__ == "__main__":
+    main()
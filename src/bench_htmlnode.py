@@ -0,0 +1,101 @@
+import sys
+import time
+
+from htmlnode import LeafNode, ParentNode
+
+
+def recursive_to_html(node):
+    if not isinstance(node, ParentNode):
+        return node.to_html()
+    res = f'<{node.tag}{node.props_to_html()}>'
+    for child in node.children:
+        res += recursive_to_html(child)
+    res += f'</{node.tag}>'
+    return res
+
+
+class UnescapedLeafNode(LeafNode):
+    __slots__ = ()
+
+    def props_to_html(self):
+        if self.props == None:
+            return ""
+        htmlnode = ""
+        for i in self.props:
+            htmlnode += f' {i}="{self.props[i]}"'
+        return htmlnode
+
+    def to_html(self):
+        if self.value is None:
+            raise ValueError("value field is empty")
+        if self.tag is None:
+            return self.value
+        return f'<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>'
+
+
+def leaves(size, leaf_class):
+    nodes = []
+    for i in range(size):
+        if i % 3 == 0:
+            nodes.append(leaf_class("a", f"link {i}", {"href": f"https://example.com/{i}", "title": "Example"}))
+        elif i % 3 == 1:
+            nodes.append(leaf_class("b", f"word {i} & more"))
+        else:
+            nodes.append(leaf_class(None, f"plain text {i}"))
+    return nodes
+
+
+def report_leaves(size):
+    for label, leaf_class in (("unescaped", UnescapedLeafNode), ("escaped", LeafNode)):
+        nodes = leaves(size, leaf_class)
+        start = time.perf_counter()
+        for node in nodes:
+            node.to_html()
+        elapsed = time.perf_counter() - start
+        print(f"{f'leaves {size}':>14} {label:>10}  {elapsed * 1000:9.1f} ms")
+
+
+def wide_tree(size):
+    paragraphs = []
+    for i in range(size // 10):
+        children = [LeafNode("b", f"word {i}.{j}") for j in range(9)]
+        paragraphs.append(ParentNode("p", children))
+    return ParentNode("div", paragraphs)
+
+
+def deep_tree(depth):
+    node = LeafNode("b", "leaf")
+    for _ in range(depth):
+        node = ParentNode("span", [node])
+    return node
+
+
+def timed(render, node):
+    start = time.perf_counter()
+    try:
+        html = render(node)
+    except RecursionError:
+        return None, None
+    return time.perf_counter() - start, len(html)
+
+
+def report(name, node):
+    for label, render in (("recursive", recursive_to_html), ("iterative", ParentNode.to_html)):
+        elapsed, size = timed(render, node)
+        if elapsed is None:
+            print(f"{name:>14} {label:>10}  RecursionError")
+        else:
+            print(f"{name:>14} {label:>10}  {elapsed * 1000:9.1f} ms  {size} chars")
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000]
+    for size in sizes:
+        report(f"wide {size}", wide_tree(size))
+    for depth in (500, 5000, 50000):
+        report(f"deep {depth}", deep_tree(depth))
+    report_leaves(300000)
+
+
+if __name__ == "__main__":
+    main()
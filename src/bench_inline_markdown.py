@@ -0,0 +1,77 @@
+import re
+import time
+
+from textnode import TextNode, TextType
+from inline_markdown import (
+    split_nodes_delimiter,
+    split_nodes_image,
+    split_nodes_link,
+    text_to_textnodes,
+)
+
+
+def split_nodes_link_by_snippet(old_nodes):
+    new_nodes = []
+    for node in old_nodes:
+        remaining = node.text
+        links = re.findall(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)", remaining)
+        for alt, url in links:
+            before, remaining = remaining.split(f"[{alt}]({url})", 1)
+            if before:
+                new_nodes.append(TextNode(before, TextType.TEXT))
+            new_nodes.append(TextNode(alt, TextType.LINK, url))
+        if remaining:
+            new_nodes.append(TextNode(remaining, TextType.TEXT))
+    return new_nodes
+
+
+def multipass_text_to_textnodes(text):
+    nodes = split_nodes_image([TextNode(text, TextType.TEXT)])
+    nodes = split_nodes_link(nodes)
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    return split_nodes_delimiter(nodes, "`", TextType.CODE)
+
+
+PARAGRAPH = (
+    "This is **text** with an _italic_ word and a `code block` and an "
+    "![obi wan image](https://i.imgur.com/fJRm4Vk.jpeg) and a [link](https://boot.dev). "
+)
+
+
+def timed(func, *args, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def bench_text_to_textnodes():
+    paragraphs = [PARAGRAPH * n for n in (1, 4, 16)] * 2000
+    def run(func):
+        for paragraph in paragraphs:
+            func(paragraph)
+    print("text_to_textnodes over 6000 paragraphs")
+    print(f"  multipass    {timed(run, multipass_text_to_textnodes) * 1000:9.1f} ms")
+    print(f"  single-pass  {timed(run, text_to_textnodes) * 1000:9.1f} ms")
+
+
+def bench_link_dense_paragraph():
+    for count in (1000, 5000, 20000):
+        text = "".join(f"see [link {i}](https://example.com/{i}) and " for i in range(count))
+        nodes = [TextNode(text, TextType.TEXT)]
+        print(f"split_nodes_link on a paragraph with {count} links")
+        print(f"  split by snippet  {timed(split_nodes_link_by_snippet, nodes, repeat=1) * 1000:9.1f} ms")
+        print(f"  finditer spans    {timed(split_nodes_link, nodes) * 1000:9.1f} ms")
+
+
+def main():
+    bench_text_to_textnodes()
+    bench_link_dense_paragraph()
+
+
+if __name__ == "__main__":
+    main()
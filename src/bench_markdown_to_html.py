@@ -0,0 +1,65 @@
+import random
+import time
+
+import markdown_to_html
+from markdown_to_html import markdown_to_html_node, parse_markdown
+from textnode import TextNode, TextType
+
+
+def synthetic_document(blocks, seed=0):
+    rng = random.Random(seed)
+    parts = ["# Synthetic document"]
+    for i in range(blocks):
+        kind = rng.randrange(6)
+        if kind == 0:
+            parts.append(f"## Section {i}")
+        elif kind == 1:
+            parts.append("\n".join(f"- item {j} with **bold** text" for j in range(rng.randint(2, 8))))
+        elif kind == 2:
+            parts.append("\n".join(f"{j}. step {j} with `code`" for j in range(1, rng.randint(2, 8))))
+        elif kind == 3:
+            parts.append("\n".join(f"> quoted line {j}" for j in range(rng.randint(1, 4))))
+        elif kind == 4:
+            parts.append("```\n" + "\n".join(f"x{j} = {j}" for j in range(rng.randint(1, 6))) + "\n```")
+        else:
+            parts.append(
+                "A paragraph with _italic_ and a [link](https://example.com/"
+                f"{i}) that goes on\nfor a couple of lines of ordinary text."
+            )
+    return "\n\n".join(parts)
+
+
+def timed(func, *args, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def plain_text_to_textnodes(text):
+    return [TextNode(text, TextType.TEXT)]
+
+
+def main():
+    document = synthetic_document(20000)
+    size_mb = len(document) / 1e6
+    elapsed = timed(markdown_to_html_node, document)
+    print(f"markdown_to_html_node, 20000 blocks ({size_mb:.1f} MB)")
+    print(f"  full pipeline  {elapsed * 1000:9.1f} ms  {size_mb / elapsed:6.1f} MB/s")
+    elapsed = timed(parse_markdown, document)
+    print(f"  direct inline  {elapsed * 1000:9.1f} ms  {size_mb / elapsed:6.1f} MB/s")
+
+    text_to_textnodes = markdown_to_html.text_to_textnodes
+    markdown_to_html.text_to_textnodes = plain_text_to_textnodes
+    try:
+        elapsed = timed(markdown_to_html_node, document)
+    finally:
+        markdown_to_html.text_to_textnodes = text_to_textnodes
+    print(f"  block stage    {elapsed * 1000:9.1f} ms  {size_mb / elapsed:6.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
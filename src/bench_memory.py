@@ -0,0 +1,78 @@
+import io
+import tracemalloc
+
+import htmlnode
+import inline_markdown
+import markdown_to_html
+import textnode
+from bench_markdown_to_html import synthetic_document
+from markdown_to_html import StreamedDocument, markdown_to_html_node, parse_markdown
+
+
+class DictTextNode(textnode.TextNode):
+    pass
+
+
+class DictLeafNode(htmlnode.LeafNode):
+    pass
+
+
+class DictParentNode(htmlnode.ParentNode):
+    pass
+
+
+def dict_backed_nodes():
+    patches = [
+        (inline_markdown, "TextNode", DictTextNode),
+        (textnode, "LeafNode", DictLeafNode),
+        (markdown_to_html, "LeafNode", DictLeafNode),
+        (markdown_to_html, "ParentNode", DictParentNode),
+    ]
+    return [(module, name, getattr(module, name), replacement) for module, name, replacement in patches]
+
+
+class DiscardWriter:
+    def write(self, text):
+        pass
+
+
+def stream(document):
+    StreamedDocument(io.StringIO(document)).write_html(DiscardWriter())
+
+
+def measure(parse, document):
+    tracemalloc.start()
+    try:
+        node = parse(document)
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    blocks = sum(stat.count for stat in snapshot.statistics("filename"))
+    del node
+    return peak, blocks
+
+
+def report(label, peak, blocks):
+    print(f"  {label:<12} peak {peak / 1e6:8.1f} MB  {blocks:10d} live allocations")
+
+
+def main():
+    document = synthetic_document(20000)
+    print(f"markdown_to_html_node, 20000 blocks ({len(document) / 1e6:.1f} MB)")
+
+    patches = dict_backed_nodes()
+    for module, name, _, replacement in patches:
+        setattr(module, name, replacement)
+    try:
+        report("dict-backed", *measure(markdown_to_html_node, document))
+    finally:
+        for module, name, original, _ in patches:
+            setattr(module, name, original)
+    report("slotted", *measure(markdown_to_html_node, document))
+    report("direct", *measure(parse_markdown, document))
+    report("streamed", *measure(stream, document))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from generate_page import find_pages
+from walk import scan_files
+
+
+class SyscallCounter:
+    names = ("stat", "lstat", "listdir", "scandir")
+
+    def __init__(self):
+        self.counts = dict.fromkeys(self.names, 0)
+        self.originals = {}
+
+    def __enter__(self):
+        for name in self.names:
+            original = getattr(os, name)
+            self.originals[name] = original
+            setattr(os, name, self.wrap(name, original))
+        return self
+
+    def __exit__(self, *exc):
+        for name, original in self.originals.items():
+            setattr(os, name, original)
+
+    def wrap(self, name, original):
+        def counted(*args, **kwargs):
+            self.counts[name] += 1
+            return original(*args, **kwargs)
+        return counted
+
+    def total(self):
+        return sum(self.counts.values())
+
+
+def listdir_find_pages(dir_path_content, dest_dir_path):
+    pages = []
+    for file in os.listdir(dir_path_content):
+        from_path = os.path.join(dir_path_content, file)
+        dest_path = os.path.join(dest_dir_path, file)
+        if os.path.isfile(from_path):
+            if file.endswith(".md"):
+                pages.append((from_path, Path(dest_path).with_suffix(".html")))
+        else:
+            pages.extend(listdir_find_pages(from_path, dest_path))
+    return pages
+
+
+def listdir_find_static(source, destination):
+    files = []
+    for name in os.listdir(source):
+        src_path = os.path.join(source, name)
+        dest_path = os.path.join(destination, name)
+        if os.path.isfile(src_path):
+            files.append((src_path, dest_path))
+        elif os.path.isdir(src_path):
+            files.extend(listdir_find_static(src_path, dest_path))
+    return files
+
+
+def make_tree(root, files, per_dir=50):
+    for i in range(files):
+        directory = os.path.join(root, f"section{i // per_dir}")
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"post{i}.md"), "w") as f:
+            f.write(f"# Post {i}\n")
+
+
+def measure(label, func, *args):
+    with SyscallCounter() as counter:
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+    calls = ", ".join(f"{name} {count}" for name, count in counter.counts.items() if count)
+    print(f"  {label:<22} {counter.total():7d} calls ({calls})  {elapsed * 1000:7.1f} ms")
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    with tempfile.TemporaryDirectory() as root:
+        content = os.path.join(root, "content")
+        make_tree(content, files)
+        print(f"page discovery over {files} files")
+        measure("listdir + isfile", listdir_find_pages, content, "docs")
+        measure("scandir", find_pages, content, "docs")
+
+        print(f"static discovery over {files} files")
+        measure("listdir + isfile/isdir", listdir_find_static, content, "docs")
+        measure("scandir", scan_files, content)
+
+
+if __name__ == "__main__":
+    main()
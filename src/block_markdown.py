@@ -8,30 +8,34 @@ class BlockType(enum.Enum):
     UNORDERED_LIST = "unordered_list"
     ORDERED_LIST = "ordered_list"
 
+_headings = ("# ", "## ", "### ", "#### ", "##### ", "###### ")
+
 def block_to_block_type(block):
-    lines = block.split("\n")
+    return lines_to_block_type(block.split("\n"))
+
+def lines_to_block_type(lines):
+    first = lines[0]
 
-    headings = ("# ", "## ", "### ", "#### ", "##### ", "###### ")
-    if block.startswith(headings):
+    if first.startswith(_headings):
         return BlockType.HEADING
     
-    if len(lines) > 1 and lines[0].startswith("```") and lines[-1].startswith("```"):
+    if len(lines) > 1 and first.startswith("```") and lines[-1].startswith("```"):
         return BlockType.CODE
 
-    if block.startswith("> "):
+    if first.startswith("> "):
         for line in lines:
             if not (line.startswith("> ") or line == ">"):
                 return BlockType.PARAGRAPH
         return BlockType.QUOTE
 
-    if block.startswith("- "):
+    if first.startswith("- "):
         for line in lines:
             if not line.startswith("- "):
                 return BlockType.PARAGRAPH
         return BlockType.UNORDERED_LIST
     
 
-    if block.startswith("1. "):
+    if first.startswith("1. "):
         i = 1 
         for line in lines:
             if not line.startswith(f"{i}. "):
@@ -42,17 +46,47 @@ def block_to_block_type(block):
     return BlockType.PARAGRAPH
 
 def markdown_to_blocks(markdown):
+    return [block for block, _ in iter_blocks(markdown.split("\n"))]
+
+def iter_blocks(lines):
+    for block_lines, block_type in iter_block_lines(lines):
+        yield "\n".join(block_lines), block_type
+
+def iter_block_lines(lines):
+    block_lines = []
+    has_content = False
+    in_fence = False
+    for line in lines:
+        if line.endswith("\n"):
+            line = line[:-1]
+        stripped = line.strip()
+
+        if in_fence:
+            block_lines.append(stripped)
+            if stripped.startswith("```"):
+                in_fence = False
+            continue
+
+        if line == "":
+            if has_content:
+                yield _finish_block(block_lines)
+            block_lines = []
+            has_content = False
+            continue
 
-    blocks = markdown.split("\n\n")
+        if stripped and not has_content:
+            in_fence = _opens_fence(stripped)
+            has_content = True
+            block_lines = []
+        block_lines.append(stripped)
 
-    stripped_blocks = []
-    for block in blocks:
-        splitted = block.split("\n")
-        stripped_blocks.append("\n".join(line.strip() for line in splitted))
+    if has_content:
+        yield _finish_block(block_lines)
 
-    final_blocks = []
-    for block in stripped_blocks:
-        if block:
-            final_blocks.append(block.strip("\n"))
+def _opens_fence(line):
+    return line.startswith("```") and "`" not in line[3:]
 
-    return final_blocks
\ No newline at end of file
+def _finish_block(block_lines):
+    while not block_lines[-1]:
+        block_lines.pop()
+    return block_lines, lines_to_block_type(block_lines)
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+
+MANIFEST_VERSION = 1
+
+
+def hash_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path):
+    with open(path, "rb") as f:
+        return hash_bytes(f.read())
+
+
+class BuildManifest:
+    def __init__(self, path=None):
+        self.path = path
+        self.settings = {}
+        self.pages = {}
+        self.static = None
+        self._hashes = {}
+        self._stats = {}
+
+    @classmethod
+    def load(cls, path):
+        manifest = cls(path)
+        if not os.path.exists(path):
+            return manifest
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return manifest
+        if data.get("version") != MANIFEST_VERSION:
+            return manifest
+        manifest.settings = data.get("settings", {})
+        manifest.pages = data.get("pages", {})
+        manifest.static = data.get("static")
+        return manifest
+
+    def save(self):
+        if self.path is None:
+            raise ValueError("manifest path is not set")
+        cache_dir = os.path.dirname(self.path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        data = {
+            "version": MANIFEST_VERSION,
+            "settings": self.settings,
+            "pages": self.pages,
+            "static": self.static,
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def start_build(self, template_text, base_path, assets=None):
+        settings = {
+            "template": hash_bytes(template_text.encode()),
+            "base_path": base_path,
+            "assets": hash_bytes(json.dumps(assets or {}, sort_keys=True).encode()),
+        }
+        if settings != self.settings:
+            self.pages = {from_path: {"dest": entry["dest"]} for from_path, entry in self.pages.items()}
+        self.settings = settings
+        self._hashes = {}
+        self._stats = {}
+
+    def source_hash(self, from_path):
+        if from_path in self._hashes:
+            return self._hashes[from_path]
+        st = self._stat(from_path)
+        entry = self.pages.get(from_path)
+        if entry and "hash" in entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            digest = entry["hash"]
+        else:
+            digest = hash_file(from_path)
+        self._hashes[from_path] = digest
+        return digest
+
+    def is_fresh(self, from_path, dest_path):
+        entry = self.pages.get(from_path)
+        if entry is None or "hash" not in entry or entry["dest"] != str(dest_path):
+            return False
+        if not os.path.exists(dest_path):
+            return False
+        if self.source_hash(from_path) != entry["hash"]:
+            return False
+        st = self._stat(from_path)
+        entry["mtime_ns"] = st.st_mtime_ns
+        entry["size"] = st.st_size
+        return True
+
+    def record(self, from_path, dest_path):
+        st = self._stat(from_path)
+        self.pages[from_path] = {
+            "dest": str(dest_path),
+            "hash": self.source_hash(from_path),
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+        }
+
+    def _stat(self, from_path):
+        if from_path not in self._stats:
+            self._stats[from_path] = os.stat(from_path)
+        return self._stats[from_path]
+
+    def prune(self, from_paths):
+        from_paths = set(from_paths)
+        stale = []
+        for from_path in list(self.pages):
+            if from_path not in from_paths:
+                stale.append(self.pages.pop(from_path)["dest"])
+        return stale
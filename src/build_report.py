@@ -0,0 +1,66 @@
+import json
+import os
+import time
+
+REPORT_VERSION = 1
+
+
+def cpu_seconds():
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+class BuildReport:
+    def __init__(self, base_path="/"):
+        self.base_path = base_path
+        self.pages = []
+        self.static = {}
+        self.wall_ms = None
+        self.cpu_ms = None
+        self._wall_start = time.perf_counter()
+        self._cpu_start = cpu_seconds()
+
+    def add_pages(self, results):
+        for stats in results:
+            self.pages.append({
+                "source": stats["source"],
+                "output": stats["output"],
+                "input_bytes": stats.get("input_bytes"),
+                "output_bytes": stats.get("output_bytes"),
+                "parse_ms": round(stats.get("parse_ms", 0.0), 3),
+                "render_ms": round(stats.get("render_ms", 0.0), 3),
+                "write_ms": round(stats.get("write_ms", 0.0), 3),
+                "cache": stats.get("parse_cache"),
+            })
+
+    def finish(self):
+        self.wall_ms = (time.perf_counter() - self._wall_start) * 1000
+        self.cpu_ms = (cpu_seconds() - self._cpu_start) * 1000
+
+    def to_dict(self):
+        return {
+            "version": REPORT_VERSION,
+            "base_path": self.base_path,
+            "wall_ms": round(self.wall_ms, 3) if self.wall_ms is not None else None,
+            "cpu_ms": round(self.cpu_ms, 3) if self.cpu_ms is not None else None,
+            "totals": {
+                "pages": len(self.pages),
+                "input_bytes": sum(page["input_bytes"] or 0 for page in self.pages),
+                "output_bytes": sum(page["output_bytes"] or 0 for page in self.pages),
+                "cache_hits": sum(1 for page in self.pages if page["cache"] == "hit"),
+            },
+            "static": self.static,
+            "pages": self.pages,
+        }
+
+    def write(self, path):
+        report_dir = os.path.dirname(path)
+        if report_dir:
+            os.makedirs(report_dir, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.to_dict(), f, indent=1)
+        os.replace(tmp_path, path)
+
+    def __repr__(self):
+        return f"BuildReport({len(self.pages)} pages, {self.wall_ms} ms)"
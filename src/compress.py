@@ -0,0 +1,98 @@
+import gzip
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from walk import scan_files
+
+COMPRESSIBLE_EXTENSIONS = {
+    ".html", ".css", ".js", ".mjs", ".json", ".xml", ".svg", ".txt", ".map", ".ico", ".wasm",
+}
+MIN_SIZE = 1024
+SIDECAR_RECORD_VERSION = 1
+
+
+class SidecarRecord:
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = {}
+
+    @classmethod
+    def load(cls, path):
+        record = cls(path)
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return record
+        if data.get("version") == SIDECAR_RECORD_VERSION:
+            record.entries = data.get("entries", {})
+        return record
+
+    def save(self):
+        if self.path is None:
+            return
+        record_dir = os.path.dirname(self.path)
+        if record_dir:
+            os.makedirs(record_dir, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": SIDECAR_RECORD_VERSION, "entries": self.entries}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def is_compressible(name, size, min_size=MIN_SIZE):
+    _, ext = os.path.splitext(name)
+    return ext.lower() in COMPRESSIBLE_EXTENSIONS and size >= min_size
+
+def compress_tree(root, min_size=MIN_SIZE, level=9, jobs=None, record=None, static_dir=None):
+    if record is None:
+        record = SidecarRecord()
+    files = {rel_path: entry for entry, rel_path in scan_files(root)}
+
+    def from_static(rel_path):
+        return static_dir is not None and os.path.isfile(os.path.join(static_dir, rel_path + ".gz"))
+
+    for rel_path in list(record.entries):
+        entry = files.get(rel_path)
+        if entry is None or not is_compressible(entry.name, entry.stat().st_size, min_size):
+            if not from_static(rel_path):
+                sidecar = files.pop(rel_path + ".gz", None)
+                if sidecar is not None:
+                    os.remove(sidecar.path)
+            del record.entries[rel_path]
+
+    pending = []
+    for rel_path, entry in files.items():
+        st = entry.stat()
+        if not is_compressible(entry.name, st.st_size, min_size):
+            continue
+        key = [st.st_size, st.st_mtime_ns]
+        sidecar = files.get(rel_path + ".gz")
+        if sidecar is not None:
+            if from_static(rel_path):
+                record.entries.pop(rel_path, None)
+                continue
+            previous = record.entries.get(rel_path)
+            if previous == key:
+                continue
+            if previous is None and sidecar.stat().st_mtime_ns >= st.st_mtime_ns:
+                continue
+        pending.append((rel_path, entry.path, key))
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(compress_file, path, level) for _, path, _ in pending]
+        for future, (rel_path, _, key) in zip(futures, pending):
+            future.result()
+            record.entries[rel_path] = key
+    record.save()
+    print(f"compressed {len(pending)} files under {root}")
+    return [path for _, path, _ in pending]
+
+def compress_file(path, level=9):
+    with open(path, "rb") as f:
+        data = f.read()
+    tmp_path = path + ".gz.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(gzip.compress(data, compresslevel=level, mtime=0))
+    os.replace(tmp_path, path + ".gz")
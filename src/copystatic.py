@@ -1,33 +1,245 @@
+import errno
 import os
 import shutil
+import stat
+import time
+from concurrent.futures import ThreadPoolExecutor
+import profiler
+from assets import ASSET_MANIFEST_NAME, AssetHashCache, asset_url, fingerprint_path, write_asset_manifest
+from build_manifest import hash_file
+from walk import scan_files
 
-def copy_static(source, destination, clean=True):
-    
+COPY_MODES = ("copy", "hardlink", "reflink")
+COPY_BUFSIZE = 1024 * 1024
+
+# FICLONE from <linux/fs.h>: share the source's extents on btrfs, XFS etc.
+FICLONE = 0x40049409
+
+_fallback_errnos = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTTY, errno.EBADF}
+
+def copy_static(source, destination, clean=True, mode="copy", jobs=None, fingerprint=False, hash_cache=None, stats=None):
+    start = time.perf_counter()
     if clean:
-        if os.path.exists(destination) and os.path.isdir(destination):
-            for filename in os.listdir(destination):
-                file_path = os.path.join(destination, filename)
-                if os.path.isfile(file_path) or os.path.islink(file_path):
-                    os.remove(file_path)
-                elif os.path.isdir(file_path):
-                    shutil.rmtree(file_path) 
-        elif os.path.exists(destination) and os.path.isfile(destination):
+        try:
+            with os.scandir(destination) as it:
+                entries = list(it)
+        except FileNotFoundError:
+            entries = []
+        except NotADirectoryError:
             os.remove(destination)
-            os.mkdir(destination)
-        elif not os.path.exists(destination):
-            os.mkdir(destination)
+            entries = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path)
+            else:
+                os.remove(entry.path)
+    os.makedirs(destination, exist_ok=True)
     
-    if not os.path.exists(source):
-        raise FileNotFoundError(source)
-    
-    for name in os.listdir(source):
-        src_path = os.path.join(source, name)
-        dest_path = os.path.join(destination, name)
-
-        if os.path.isfile(src_path):
-            shutil.copy(src_path, dest_path)
-            print(f"copied file: {src_path} -> {dest_path}")
-        elif os.path.isdir(src_path):
-            if not os.path.exists(dest_path):
-                os.mkdir(dest_path)
-            copy_static(src_path, dest_path, clean=False)
\ No newline at end of file
+    files = []
+    dest_dirs = set()
+    copied_bytes = 0
+    with profiler.stage("discovery"):
+        targets, assets = static_targets(source, fingerprint, hash_cache)
+    for entry, dest_rel_path in targets:
+        dest_path = os.path.join(destination, dest_rel_path)
+        files.append((entry.path, dest_path))
+        dest_dirs.add(os.path.dirname(dest_path))
+        if stats is not None:
+            copied_bytes += entry.stat().st_size
+
+    for dest_dir in sorted(dest_dirs):
+        os.makedirs(dest_dir, exist_ok=True)
+    with profiler.stage("static copy"):
+        copy_files(files, mode=mode, jobs=jobs)
+    if fingerprint:
+        write_asset_manifest(os.path.join(destination, ASSET_MANIFEST_NAME), assets)
+    print(f"copied {len(files)} files: {source} -> {destination}")
+    if stats is not None:
+        record_copy_stats(stats, mode, len(files), len(files), copied_bytes, start)
+    return assets
+
+def sync_static(source, destination, previous=None, use_hash=False, mode="copy", jobs=None, fingerprint=False, hash_cache=None, stats=None, keep=()):
+    start = time.perf_counter()
+    copied_bytes = 0
+    current = []
+    changed = []
+    dest_dirs = set()
+    with profiler.stage("discovery"):
+        targets, assets = static_targets(source, fingerprint, hash_cache)
+    for entry, rel_path in targets:
+        dest_path = os.path.join(destination, rel_path)
+        current.append(rel_path)
+        src_stat = entry.stat()
+        if is_up_to_date(entry.path, dest_path, use_hash, src_stat=src_stat):
+            continue
+        changed.append((entry.path, dest_path))
+        dest_dirs.add(os.path.dirname(dest_path))
+        copied_bytes += src_stat.st_size
+
+    for dest_dir in sorted(dest_dirs):
+        os.makedirs(dest_dir, exist_ok=True)
+    with profiler.stage("static copy"):
+        copy_files(changed, mode=mode, jobs=jobs)
+    print(f"copied {len(changed)} of {len(current)} files: {source} -> {destination}")
+    if fingerprint:
+        os.makedirs(destination, exist_ok=True)
+        write_asset_manifest(os.path.join(destination, ASSET_MANIFEST_NAME), assets)
+        current.append(ASSET_MANIFEST_NAME)
+
+    current_set = set(current)
+    if previous is None:
+        # Without a record of the last sync, sweep everything that is neither
+        # a static target nor one of the kept outputs.
+        current_set.update(keep)
+        previous = [rel_path for _, rel_path in scan_files(destination)] if os.path.isdir(destination) else []
+    stale_dirs = set()
+    for rel_path in previous:
+        if rel_path in current_set:
+            continue
+        dest_path = os.path.join(destination, rel_path)
+        try:
+            os.remove(dest_path)
+        except (FileNotFoundError, IsADirectoryError):
+            continue
+        print(f"removed stale file: {dest_path}")
+        stale_dirs.add(os.path.dirname(dest_path))
+    remove_empty_dirs(destination, stale_dirs)
+
+    if stats is not None:
+        record_copy_stats(stats, mode, len(current), len(changed), copied_bytes, start)
+    return current
+
+def remove_empty_dirs(root, dirs):
+    root = os.path.normpath(root)
+    for dir_path in sorted(dirs, key=len, reverse=True):
+        dir_path = os.path.normpath(dir_path)
+        while dir_path != root and dir_path.startswith(root + os.sep):
+            try:
+                os.rmdir(dir_path)
+            except OSError:
+                break
+            dir_path = os.path.dirname(dir_path)
+
+def record_copy_stats(stats, mode, files, copied, copied_bytes, start):
+    stats["mode"] = mode
+    stats["files"] = files
+    stats["copied"] = copied
+    stats["copied_bytes"] = copied_bytes
+    stats["ms"] = round((time.perf_counter() - start) * 1000, 3)
+
+def static_targets(source, fingerprint=False, hash_cache=None):
+    files = scan_files(source)
+    if not fingerprint:
+        return files, {}
+    if hash_cache is None:
+        hash_cache = AssetHashCache()
+    targets = []
+    assets = {}
+    for entry, rel_path in files:
+        dest_rel_path = fingerprint_path(rel_path, hash_cache.hash(entry.path, entry.stat()))
+        targets.append((entry, dest_rel_path))
+        assets[asset_url(rel_path)] = asset_url(dest_rel_path)
+    return targets, assets
+
+def is_up_to_date(src_path, dest_path, use_hash=False, src_stat=None):
+    try:
+        dest_stat = os.stat(dest_path)
+    except FileNotFoundError:
+        return False
+    if src_stat is None:
+        src_stat = os.stat(src_path)
+    if src_stat.st_size != dest_stat.st_size:
+        return False
+    if use_hash:
+        return hash_file(src_path) == hash_file(dest_path)
+    return src_stat.st_mtime_ns == dest_stat.st_mtime_ns
+
+def copy_files(files, mode="copy", jobs=None):
+    if mode not in COPY_MODES:
+        raise ValueError(f"invalid copy mode: {mode}")
+    if jobs is None:
+        jobs = min(32, (os.cpu_count() or 1) + 4)
+    jobs = max(1, min(jobs, len(files)))
+    if jobs == 1:
+        _copy_batch(files, mode)
+        return
+    batches = [files[i::jobs] for i in range(jobs)]
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        for future in [executor.submit(_copy_batch, batch, mode) for batch in batches]:
+            future.result()
+
+def _copy_batch(files, mode):
+    for src_path, dest_path in files:
+        copy_file(src_path, dest_path, mode)
+
+def copy_file(src_path, dest_path, mode="copy"):
+    try:
+        os.remove(dest_path)
+    except FileNotFoundError:
+        pass
+
+    if mode == "hardlink":
+        try:
+            os.link(src_path, dest_path)
+            return
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.EOPNOTSUPP):
+                raise
+
+    with open(src_path, "rb") as src, open(dest_path, "wb") as dest:
+        st = os.fstat(src.fileno())
+        copied = mode == "reflink" and _reflink(src, dest)
+        if not copied:
+            copied = _kernel_copy(src, dest, st.st_size)
+        if not copied:
+            dest.seek(0)
+            dest.truncate()
+            shutil.copyfileobj(src, dest, COPY_BUFSIZE)
+    os.chmod(dest_path, stat.S_IMODE(st.st_mode))
+    os.utime(dest_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+def _reflink(src, dest):
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        fcntl.ioctl(dest.fileno(), FICLONE, src.fileno())
+    except OSError as e:
+        if e.errno not in _fallback_errnos:
+            raise
+        return False
+    return True
+
+def _kernel_copy(src, dest, size):
+    for copy_chunk in _kernel_copy_chunks:
+        copied = _copy_range(src, dest, size, copy_chunk)
+        if copied is not None:
+            return copied
+    return False
+
+def _copy_file_range_chunk(src_fd, dest_fd, offset, count):
+    return os.copy_file_range(src_fd, dest_fd, count, offset, offset)
+
+def _sendfile_chunk(src_fd, dest_fd, offset, count):
+    return os.sendfile(dest_fd, src_fd, offset, count)
+
+_kernel_copy_chunks = [
+    copy_chunk
+    for name, copy_chunk in (("copy_file_range", _copy_file_range_chunk), ("sendfile", _sendfile_chunk))
+    if hasattr(os, name)
+]
+
+def _copy_range(src, dest, size, copy_chunk):
+    offset = 0
+    try:
+        while offset < size:
+            sent = copy_chunk(src.fileno(), dest.fileno(), offset, size - offset)
+            if sent == 0:
+                break
+            offset += sent
+    except OSError as e:
+        if offset > 0 or e.errno not in _fallback_errnos:
+            raise
+        return None
+    return offset == size
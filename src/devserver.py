@@ -0,0 +1,226 @@
+import hashlib
+import mimetypes
+import os
+import posixpath
+import threading
+import time
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+from generate_page import render_page
+from template import Template
+from watch import diff_snapshots, snapshot, stat_key
+
+LIVE_RELOAD_PATH = "/__livereload"
+LIVE_RELOAD_SCRIPT = (
+    f'<script>new EventSource("{LIVE_RELOAD_PATH}")'
+    '.onmessage = function () { location.reload(); };</script>'
+)
+
+
+def make_etag(body):
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+def inject_live_reload(html):
+    index = html.rfind("</body>")
+    if index == -1:
+        return html + LIVE_RELOAD_SCRIPT
+    return html[:index] + LIVE_RELOAD_SCRIPT + html[index:]
+
+
+class LRUCache:
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def discard(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class DevSite:
+    def __init__(self, dir_path_content, dir_path_static, template_path, cache_size=256):
+        self.dir_path_content = dir_path_content
+        self.dir_path_static = dir_path_static
+        self.template_path = template_path
+        self.cache = LRUCache(cache_size)
+        self.template = Template.from_file(template_path)
+        self.template_key = stat_key(template_path)
+        self.content = snapshot(dir_path_content, ".md")
+        self.static = snapshot(dir_path_static)
+        self.version = 0
+        self.changed = threading.Condition()
+
+    def resolve(self, url_path):
+        rel_path = posixpath.normpath(unquote(url_path)).lstrip("/")
+        if rel_path == ".." or rel_path.startswith("../"):
+            return None
+
+        static_path = os.path.join(self.dir_path_static, rel_path)
+        if rel_path and os.path.isfile(static_path):
+            return "static", static_path
+
+        if not rel_path:
+            candidates = ["index.md"]
+        elif rel_path.endswith(".html"):
+            candidates = [rel_path[:-len(".html")] + ".md"]
+        else:
+            candidates = [os.path.join(rel_path, "index.md"), rel_path + ".md"]
+        for candidate in candidates:
+            from_path = os.path.join(self.dir_path_content, candidate)
+            if os.path.isfile(from_path):
+                return "page", from_path
+        return None
+
+    def get_page(self, from_path):
+        source_key = stat_key(from_path)
+        cached = self.cache.get(from_path)
+        if cached is not None and cached[0] == source_key:
+            return cached[1], cached[2]
+        body = inject_live_reload(render_page(from_path, self.template)).encode("utf-8")
+        etag = make_etag(body)
+        self.cache.put(from_path, (source_key, body, etag))
+        return body, etag
+
+    def poll(self):
+        template_key = stat_key(self.template_path)
+        content = snapshot(self.dir_path_content, ".md")
+        static = snapshot(self.dir_path_static)
+        changed_pages, removed_pages = diff_snapshots(self.content, content)
+        changed_static, removed_static = diff_snapshots(self.static, static)
+
+        if template_key != self.template_key:
+            self.template = Template.from_file(self.template_path)
+            self.cache.clear()
+            changed_pages = list(content)
+        for rel_path in changed_pages + removed_pages:
+            self.cache.discard(os.path.join(self.dir_path_content, rel_path))
+
+        self.template_key = template_key
+        self.content = content
+        self.static = static
+
+        if changed_pages or removed_pages or changed_static or removed_static:
+            with self.changed:
+                self.version += 1
+                self.changed.notify_all()
+            return True
+        return False
+
+    def wait_for_change(self, version, timeout):
+        with self.changed:
+            self.changed.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+    def watch(self, interval=0.1):
+        while True:
+            time.sleep(interval)
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Error: watching for changes failed: {e}; retrying")
+
+
+class DevRequestHandler(BaseHTTPRequestHandler):
+    site = None
+
+    def do_GET(self):
+        url_path = urlsplit(self.path).path
+        if url_path == LIVE_RELOAD_PATH:
+            self.stream_reloads()
+            return
+
+        resolved = self.site.resolve(url_path)
+        if resolved is None:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        kind, path = resolved
+
+        if kind == "static":
+            with open(path, "rb") as f:
+                body = f.read()
+            content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            etag = make_etag(body)
+        else:
+            try:
+                body, etag = self.site.get_page(path)
+            except Exception as e:
+                # The reason phrase is latin-1 encoded, so details go in the body.
+                self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR, explain=f"Failed to render {path}: {e}")
+                return
+            content_type = "text/html; charset=utf-8"
+
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def stream_reloads(self):
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        version = self.site.version
+        try:
+            while True:
+                new_version = self.site.wait_for_change(version, timeout=15)
+                if new_version == version:
+                    self.wfile.write(b": keep-alive\n\n")
+                else:
+                    self.wfile.write(b"data: reload\n\n")
+                    version = new_version
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def make_server(site, host="127.0.0.1", port=8888):
+    handler = type("BoundDevRequestHandler", (DevRequestHandler,), {"site": site})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+def serve(dir_path_content, dir_path_static, template_path, host="127.0.0.1", port=8888):
+    site = DevSite(dir_path_content, dir_path_static, template_path)
+    threading.Thread(target=site.watch, daemon=True).start()
+    server = make_server(site, host, port)
+    print(f"Serving on http://{host}:{port} (live reload enabled)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Stopped serving.")
+    finally:
+        server.server_close()
@@ -1,50 +1,198 @@
 from pathlib import Path
+import io
 import os
-from markdown_to_html import markdown_to_html_node, extract_title
+import time
+from concurrent.futures import ProcessPoolExecutor
+import profiler
+from markdown_to_html import StreamedDocument, extract_title, parse_markdown
+from profiler import Profiler
+from template import Template
+from walk import scan_files
 
-def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, base_path):
+class PageGenerationError(Exception):
+    def __init__(self, from_path, error):
+        super().__init__(f"Failed to generate page {from_path}: {error}")
+        self.from_path = from_path
+        self.error = error
+
+def find_pages(dir_path_content, dest_dir_path):
+    pages = []
+    for entry, rel_path in scan_files(dir_path_content):
+        if entry.name.endswith(".md"):
+            pages.append((entry.path, page_dest_path(dest_dir_path, rel_path)))
+    return pages
+
+def page_dest_path(dest_dir_path, rel_path):
+    return Path(os.path.join(dest_dir_path, rel_path)).with_suffix(".html")
+
+def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, base_path, jobs=1, manifest=None, assets=None, cache=None, measure=False):
     
-    for file in os.listdir(dir_path_content):
-        from_path = os.path.join(dir_path_content, file)
-        dest_path = os.path.join(dest_dir_path, file)
-        if os.path.isfile(from_path):
-            if file.endswith(".md"):
-                dest_path = Path(dest_path).with_suffix(".html")
-                generate_page(from_path, template_path, dest_path, base_path)
-        else:
-            generate_pages_recursive(from_path, template_path, dest_path, base_path)
+    with profiler.stage("discovery"):
+        pages = find_pages(dir_path_content, dest_dir_path)
+    template = Template.from_file(template_path, base_path, assets)
+    measure = measure or profiler.active is not None
+
+    if manifest is not None:
+        manifest.start_build(template.text, base_path, template.assets)
+        for stale_path in manifest.prune(from_path for from_path, _ in pages):
+            try:
+                os.remove(stale_path)
+            except FileNotFoundError:
+                pass
+        total = len(pages)
+        pages = [page for page in pages if not manifest.is_fresh(*page)]
+        print(f"{len(pages)} of {total} pages out of date")
+
+    results = []
+    if jobs <= 1 or len(pages) <= 1:
+        for from_path, dest_path in pages:
+            try:
+                stats = generate_page(
+                    from_path, template_path, dest_path, base_path, template=template, cache=cache, measure=measure
+                )
+            except Exception as e:
+                raise PageGenerationError(from_path, e) from e
+            results.append(stats)
+            if manifest is not None:
+                manifest.record(from_path, dest_path)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [
+                executor.submit(
+                    generate_page, from_path, template_path, dest_path, base_path, template=template, cache=cache, measure=measure
+                )
+                for from_path, dest_path in pages
+            ]
+            for (from_path, dest_path), future in zip(pages, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    for pending in futures:
+                        pending.cancel()
+                    raise PageGenerationError(from_path, e) from e
+                if manifest is not None:
+                    manifest.record(from_path, dest_path)
+
+    if profiler.active is not None:
+        for stats in results:
+            profiler.active.merge(stats["stages"])
+            profiler.active.add_page(stats["source"], stats["elapsed"])
+    if cache is not None and results:
+        print(cache_summary(results))
+    return results
 
-def generate_page(from_path, template_path, dest_path, base_path):
+def cache_summary(results):
+    page_hits = sum(1 for stats in results if stats["parse_cache"] == "hit")
+    block_hits = sum(stats["block_hits"] for stats in results)
+    block_misses = sum(stats["block_misses"] for stats in results)
+    summary = f"parse cache: {page_hits} of {len(results)} pages reused"
+    blocks = block_hits + block_misses
+    if blocks:
+        summary += f"; blocks: {block_hits} reused, {block_misses} rendered ({block_hits / blocks:.0%} hit rate)"
+    return summary
+
+def generate_page(from_path, template_path, dest_path, base_path, template=None, cache=None, measure=False):
 
     print(f"Generating page from {from_path} to {dest_path} using {template_path}")
 
-    if not os.path.exists(from_path):
-        raise FileNotFoundError(f"Markdown file not found: {from_path}")
+    if template is None:
+        template = Template.from_file(template_path, base_path)
 
-    if not os.path.exists(template_path):
-        raise FileNotFoundError(f"Template file not found: {template_path}")
+    stats = {"source": from_path, "output": str(dest_path), "parse_cache": None, "block_hits": 0, "block_misses": 0}
+    if measure:
+        return measure_page(from_path, dest_path, template, cache, stats)
 
-    _, ext = os.path.splitext(from_path)
-    if ext.lower() != ".md":
-        raise ValueError(f"Expected a .md file, got: {ext}")
-    with open(from_path, "r") as f:
-        markdown_text = f.read()
-
-    _, ext = os.path.splitext(template_path)
-    if ext.lower() != ".html":
-        raise ValueError(f"Expected a .html file, got: {ext}")
-    with open(template_path, "r") as f:
-        template_text = f.read()
-    
-    html = markdown_to_html_node(markdown_text).to_html()
-    title = extract_title(markdown_text)
+    if cache is None:
+        make_dest_dir(dest_path)
+        tmp_path = f"{dest_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                stream_page(from_path, template, f)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        os.replace(tmp_path, dest_path)
+        return stats
 
-    output = template_text.replace("{{ Title }}", title).replace("{{ Content }}", html)
-    output = output.replace('href="/', f'href="{base_path}').replace('src="/', f'src="{base_path}')
+    parsed = parse_page(from_path, cache, stats)
+    make_dest_dir(dest_path)
+    with open(dest_path, "w") as f:
+        template.write(f, parsed.title, parsed.node)
+    return stats
 
+def measure_page(from_path, dest_path, template, cache, stats):
+    page_profiler = Profiler()
+    previous = profiler.set_profiler(page_profiler)
+    start = time.perf_counter()
+    try:
+        parsed = parse_page(from_path, cache, stats)
+        parsed_at = time.perf_counter()
+        content = parsed.node.to_html()
+        with page_profiler.stage("template"):
+            html = template.render(parsed.title, content)
+        rendered_at = time.perf_counter()
+        make_dest_dir(dest_path)
+        with page_profiler.stage("write"):
+            with open(dest_path, "w") as f:
+                f.write(html)
+                stats["output_bytes"] = len(html.encode(f.encoding))
+        written_at = time.perf_counter()
+    finally:
+        profiler.set_profiler(previous)
+    stats["parse_ms"] = (parsed_at - start) * 1000
+    stats["render_ms"] = (rendered_at - parsed_at) * 1000
+    stats["write_ms"] = (written_at - rendered_at) * 1000
+    stats["elapsed"] = written_at - start
+    stats["stages"] = page_profiler.stages
+    return stats
 
+def make_dest_dir(dest_path):
     dest_dir = os.path.dirname(dest_path)
     if dest_dir:
         os.makedirs(dest_dir, exist_ok=True)
-    with open(dest_path, "w") as f:
-        f.write(output)
\ No newline at end of file
+
+def render_page(from_path, template):
+    parsed = parse_page(from_path)
+    output = io.StringIO()
+    template.write(output, parsed.title, parsed.node)
+    return output.getvalue()
+
+def check_markdown_path(from_path):
+    _, ext = os.path.splitext(from_path)
+    if ext.lower() != ".md":
+        raise ValueError(f"Expected a .md file, got: {ext}")
+
+def stream_page(from_path, template, fp):
+    # Two passes over the source: the title is needed before the content
+    # starts, and blocks are then converted and written one at a time.
+    check_markdown_path(from_path)
+    try:
+        with open(from_path, "r") as f:
+            title = extract_title(f)
+        with open(from_path, "r") as f:
+            template.write(fp, title, StreamedDocument(f))
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Markdown file not found: {from_path}")
+
+def parse_page(from_path, cache=None, stats=None):
+    check_markdown_path(from_path)
+
+    try:
+        if cache is not None or profiler.active is not None:
+            with profiler.stage("reading"):
+                with open(from_path, "rb") as f:
+                    source = f.read()
+            if stats is not None:
+                stats["input_bytes"] = len(source)
+            if cache is not None:
+                parsed = cache.parse(source, from_path, stats)
+            else:
+                parsed = parse_markdown(io.TextIOWrapper(io.BytesIO(source)))
+        else:
+            with open(from_path, "r") as f:
+                parsed = parse_markdown(f)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Markdown file not found: {from_path}")
+    if parsed.title is None:
+        raise Exception("No h1 header found")
+    return parsed
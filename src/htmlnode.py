@@ -1,4 +1,20 @@
+import profiler
+
+def escape_text(text):
+    if "&" in text or "<" in text or ">" in text:
+        return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return text
+
+def escape_attr(value):
+    if not isinstance(value, str):
+        value = str(value)
+    if "&" in value or "<" in value or ">" in value or '"' in value:
+        return escape_text(value).replace('"', "&quot;")
+    return value
+
 class HTMLNode:
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag=None, value=None, children=None, props=None):
         self.tag = tag
         self.value = value
@@ -7,19 +23,27 @@ class HTMLNode:
 
     def to_html(self):
         raise NotImplementedError("to_html method not implemented")
+
+    def write_html(self, fp):
+        self._render(fp.write)
+
+    def _render(self, write):
+        write(self.to_html())
     
     def props_to_html(self):
-        if self.props == None:
+        if not self.props:
             return ""
-        htmlnode = ""
-        for i in self.props:
-            htmlnode += f' {i}="{self.props[i]}"'
-        return htmlnode
+        attrs = "".join([f' {key}="{value}"' for key, value in self.props.items()])
+        if "&" in attrs or "<" in attrs or ">" in attrs or attrs.count('"') != 2 * len(self.props):
+            attrs = "".join([f' {key}="{escape_attr(value)}"' for key, value in self.props.items()])
+        return attrs
 
     def __repr__(self):
         return f"HTMLNode({self.tag}, {self.value}, {self.children}, {self.props})"
     
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, value, props=None):
         super().__init__(tag, value, None, props)
     
@@ -27,26 +51,63 @@ class LeafNode(HTMLNode):
         if self.value is None:
             raise ValueError("value field is empty")
         if self.tag is None:
-            return self.value
-        return f'<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>'
+            return escape_text(self.value)
+        return f'<{self.tag}{self.props_to_html()}>{escape_text(self.value)}</{self.tag}>'
 
     def __repr__(self):
         return f"LeafNode({self.tag}, {self.value}, {self.props})"
 
+class RawHTMLNode(HTMLNode):
+    __slots__ = ()
+
+    def __init__(self, value):
+        super().__init__(None, value, None, None)
+
+    def to_html(self):
+        if self.value is None:
+            raise ValueError("value field is empty")
+        return self.value
+
+    def __repr__(self):
+        return f"RawHTMLNode({self.value})"
+
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, children, props=None):
         super().__init__(tag, None, children, props)
     
     def to_html(self):
+        parts = []
+        if profiler.active is not None:
+            with profiler.active.stage("render"):
+                self._render(parts.append)
+                return "".join(parts)
+        self._render(parts.append)
+        return "".join(parts)
+
+    def _render(self, write):
+        self._check()
+        write(f'<{self.tag}{self.props_to_html()}>')
+        stack = [(self, iter(self.children))]
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                if isinstance(child, ParentNode):
+                    child._check()
+                    write(f'<{child.tag}{child.props_to_html()}>')
+                    stack.append((child, iter(child.children)))
+                    break
+                write(child.to_html())
+            else:
+                write(f'</{node.tag}>')
+                stack.pop()
+
+    def _check(self):
         if self.tag is None:
             raise ValueError("tag field is empty")
         if self.children is None:
             raise ValueError("children field is empty")
-        res = f'<{self.tag}{self.props_to_html()}>'
-        for child in self.children:
-            res += child.to_html()
-        res += f'</{self.tag}>'
-        return res
 
     def __repr__(self):
         return f"LeafNode({self.tag}, {self.children}, {self.props})"
\ No newline at end of file
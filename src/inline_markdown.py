@@ -1,15 +1,122 @@
 import re
+import sys
+from collections import OrderedDict
 
+import profiler
 from textnode import TextType, TextNode
 
+_image_pattern = re.compile(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")
+_link_pattern = re.compile(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)")
+_span_pattern = re.compile(f"{_image_pattern.pattern}|{_link_pattern.pattern}")
+_delimiter_pattern = re.compile(r"\*\*|_|`")
+
+# Delimiters in the order split_nodes_delimiter passes would apply them. A
+# delimiter of lower precedence inside an open span is literal text; one of
+# higher precedence would have split the span first, leaving it unclosed.
+_delimiter_precedence = {"**": 0, "_": 1, "`": 2}
+_delimiter_types = {"**": TextType.BOLD, "_": TextType.ITALIC, "`": TextType.CODE}
+
+DEFAULT_MEMO_ENTRIES = 4096
+_memo = None
+
+
+class TextNodeMemo:
+    def __init__(self, max_entries=DEFAULT_MEMO_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, text):
+        nodes = self.entries.get(text)
+        if nodes is not None:
+            self.entries.move_to_end(text)
+            self.hits += 1
+            return nodes
+        self.misses += 1
+        nodes = tuple(_text_to_textnodes(text))
+        self.entries[text] = nodes
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return nodes
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def memory_footprint(self):
+        size = sys.getsizeof(self.entries)
+        for text, nodes in self.entries.items():
+            size += sys.getsizeof(text) + sys.getsizeof(nodes)
+            for node in nodes:
+                size += sys.getsizeof(node) + sys.getsizeof(node.text)
+                if node.url is not None:
+                    size += sys.getsizeof(node.url)
+        return size
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        return (
+            f"TextNodeMemo({len(self.entries)} entries, {self.hits} hits, {self.misses} misses, "
+            f"{self.hit_rate():.0%} hit rate, {self.memory_footprint() / 1024:.1f} KiB)"
+        )
+
+
+def get_textnode_memo():
+    return _memo
+
+def set_textnode_memo(memo):
+    global _memo
+    previous = _memo
+    _memo = memo
+    return previous
+
 def text_to_textnodes(text):
-    node = TextNode(text, TextType.TEXT)
-    new_nodes = split_nodes_image([node])
-    new_nodes = split_nodes_link(new_nodes)
-    new_nodes = split_nodes_delimiter(new_nodes, "**", TextType.BOLD)
-    new_nodes = split_nodes_delimiter(new_nodes, "_", TextType.ITALIC)
-    new_nodes = split_nodes_delimiter(new_nodes, "`", TextType.CODE)
-    return new_nodes
+    if profiler.active is not None:
+        with profiler.active.stage("inline parse"):
+            return _memo.get(text) if _memo is not None else _text_to_textnodes(text)
+    if _memo is not None:
+        return _memo.get(text)
+    return _text_to_textnodes(text)
+
+def _text_to_textnodes(text):
+    nodes = []
+    pos = 0
+    for match in _span_pattern.finditer(text):
+        _scan_delimited(text, pos, match.start(), nodes)
+        if match.group(2) is not None:
+            nodes.append(TextNode(match.group(1), TextType.IMAGE, match.group(2)))
+        else:
+            nodes.append(TextNode(match.group(3), TextType.LINK, match.group(4)))
+        pos = match.end()
+    _scan_delimited(text, pos, len(text), nodes)
+    return nodes
+
+def _scan_delimited(text, start, end, nodes):
+    open_delimiter = None
+    last = start
+    for match in _delimiter_pattern.finditer(text, start, end):
+        delimiter = match.group()
+        if open_delimiter is not None and delimiter != open_delimiter:
+            if _delimiter_precedence[delimiter] > _delimiter_precedence[open_delimiter]:
+                continue
+            raise ValueError("invalid markdown, formatted section not closed")
+        if last < match.start():
+            text_type = _delimiter_types[open_delimiter] if open_delimiter else TextType.TEXT
+            nodes.append(TextNode(text[last:match.start()], text_type))
+        open_delimiter = None if open_delimiter else delimiter
+        last = match.end()
+    if open_delimiter is not None:
+        raise ValueError("invalid markdown, formatted section not closed")
+    if last < end:
+        nodes.append(TextNode(text[last:end], TextType.TEXT))
 
 def split_nodes_delimiter(old_nodes, delimiter, text_type):
     new_nodes = []
@@ -32,69 +139,35 @@ def split_nodes_delimiter(old_nodes, delimiter, text_type):
     return new_nodes
 
 def split_nodes_image(old_nodes):
-    new_nodes = []
-    for node in old_nodes:
-        if node.text_type != TextType.TEXT:
-            new_nodes.append(node)
-            continue
-
-        remaining = node.text
-        images = extract_markdown_images(remaining)
-        if not images:
-            new_nodes.append(node)
-            continue
-
-        for alt, url in images:
-            snippet = f"![{alt}]({url})"
-            before_after = remaining.split(snippet, 1)
-            before = before_after[0]
-            after = before_after[1] if len(before_after) > 1 else ""
-
-            if before:
-                new_nodes.append(TextNode(before, TextType.TEXT))
-            new_nodes.append(TextNode(alt, TextType.IMAGE, url))
-
-            remaining = after
-
-        if remaining:
-            new_nodes.append(TextNode(remaining, TextType.TEXT))
-    
-    return new_nodes
+    return _split_nodes_pattern(old_nodes, _image_pattern, TextType.IMAGE)
 
 def split_nodes_link(old_nodes):
+    return _split_nodes_pattern(old_nodes, _link_pattern, TextType.LINK)
+
+def _split_nodes_pattern(old_nodes, pattern, text_type):
     new_nodes = []
     for node in old_nodes:
         if node.text_type != TextType.TEXT:
             new_nodes.append(node)
             continue
 
-        remaining = node.text
-        images = extract_markdown_links(remaining)
-        if not images:
-            new_nodes.append(node)
-            continue
-
-        for alt, url in images:
-            snippet = f"[{alt}]({url})"
-            before_after = remaining.split(snippet, 1)
-            before = before_after[0]
-            after = before_after[1] if len(before_after) > 1 else ""
+        text = node.text
+        pos = 0
+        for match in pattern.finditer(text):
+            if pos < match.start():
+                new_nodes.append(TextNode(text[pos:match.start()], TextType.TEXT))
+            new_nodes.append(TextNode(match.group(1), text_type, match.group(2)))
+            pos = match.end()
 
-            if before:
-                new_nodes.append(TextNode(before, TextType.TEXT))
-            new_nodes.append(TextNode(alt, TextType.LINK, url))
-
-            remaining = after
-
-        if remaining:
-            new_nodes.append(TextNode(remaining, TextType.TEXT))
+        if pos == 0:
+            new_nodes.append(node)
+        elif pos < len(text):
+            new_nodes.append(TextNode(text[pos:], TextType.TEXT))
     
     return new_nodes
 
 def extract_markdown_images(text):
-    pattern = r"!\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    return re.findall(pattern, text)
+    return _image_pattern.findall(text)
 
 def extract_markdown_links(text):
-    pattern = r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    return re.findall(pattern, text)
+    return _link_pattern.findall(text)
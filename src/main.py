@@ -1,29 +1,249 @@
+import argparse
+import os
 import sys
-from copystatic import copy_static
-from generate_page import generate_pages_recursive
+from assets import ASSET_MANIFEST_NAME, AssetHashCache, load_asset_manifest
+from build_manifest import BuildManifest
+from build_report import BuildReport
+from copystatic import copy_static, sync_static, COPY_MODES
+from generate_page import find_pages, generate_pages_recursive, PageGenerationError
+from inline_markdown import TextNodeMemo, set_textnode_memo
+from parse_cache import DEFAULT_MAX_BYTES, ParseCache
+import profiler
+from watch import Watcher
+from devserver import serve
+from compress import compress_tree, MIN_SIZE, SidecarRecord
 
 dir_path_static = "./static"
 dir_path_public = "./docs"
 dir_path_content = "./content"
 template_path = "./template.html"
+dir_path_cache = "./.ssg-cache"
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build the static site")
+    parser.add_argument("base_path", nargs="?", default="/")
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=1,
+        help="number of worker processes used to render pages",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only re-render pages whose source, template or base path changed",
+    )
+    parser.add_argument(
+        "--hash-static",
+        action="store_true",
+        help="with --incremental, compare static files by content hash instead of size and mtime",
+    )
+    parser.add_argument(
+        "--copy-mode",
+        choices=COPY_MODES,
+        default="copy",
+        help="how static files are placed in the public directory",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="reuse parsed pages and rendered blocks from earlier builds via an on-disk cache",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=dir_path_cache,
+        help="directory for the build manifest, asset hashes and parsed-page cache",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_MAX_BYTES // (1024 * 1024),
+        help="maximum size of the parsed-page cache in MiB",
+    )
+    parser.add_argument(
+        "--inline-memo",
+        type=int,
+        default=0,
+        metavar="ENTRIES",
+        help="memoize inline markdown parsing for up to ENTRIES distinct strings (0 disables)",
+    )
+    parser.add_argument(
+        "--fingerprint",
+        action="store_true",
+        help="publish static files under content-hashed names and point pages at them",
+    )
+    parser.add_argument(
+        "--gzip",
+        action="store_true",
+        help="write .gz sidecars next to compressible files in the public directory",
+    )
+    parser.add_argument(
+        "--gzip-min-size",
+        type=int,
+        default=MIN_SIZE,
+        help="smallest file size in bytes that gets a .gz sidecar",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="time each build stage and print a ranked report with the slowest pages",
+    )
+    parser.add_argument(
+        "--report",
+        nargs="?",
+        const="build-report.json",
+        metavar="PATH",
+        help="write per-page and static copy timings as JSON (default path: build-report.json)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="after building, rebuild changed pages and static files until interrupted",
+    )
+    args = parser.parse_args()
+    if args.fingerprint and args.watch:
+        parser.error("--fingerprint cannot be combined with --watch")
+    return args
+
+def parse_serve_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="main.py serve",
+        description="Serve the site from memory with live reload",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8888)
+    return parser.parse_args(argv)
 
 def main():
     
-    print("Deleting public directory...")
-    print("Copying static files to public directory...")
-    copy_static(dir_path_static, dir_path_public)
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        serve_args = parse_serve_args(sys.argv[2:])
+        serve(dir_path_content, dir_path_static, template_path, serve_args.host, serve_args.port)
+        return
+
+    args = parse_args()
+    base_path = args.base_path
+
+    report = BuildReport(base_path) if args.report else None
+    static_stats = report.static if report is not None else None
+
+    build_profiler = None
+    if args.profile:
+        build_profiler = profiler.Profiler()
+        profiler.set_profiler(build_profiler)
+
+    hash_cache = None
+    if args.fingerprint:
+        hash_cache = AssetHashCache.load(os.path.join(args.cache_dir, "asset-hashes.json"))
+
+    memo = None
+    if args.inline_memo > 0:
+        memo = TextNodeMemo(args.inline_memo)
+        set_textnode_memo(memo)
 
-    base_path = sys.argv[1] if len(sys.argv) > 1 else "/"
+    parse_cache = None
+    if args.cache:
+        parse_cache = ParseCache(os.path.join(args.cache_dir, "parsed"), args.cache_size * 1024 * 1024)
+    manifest = None
+    assets = None
+    if args.incremental:
+        manifest = BuildManifest.load(os.path.join(args.cache_dir, "manifest.json"))
+        keep = []
+        if manifest.static is None:
+            keep = [os.path.relpath(dest_path, dir_path_public) for _, dest_path in find_pages(dir_path_content, dir_path_public)]
+        print("Syncing static files to public directory...")
+        manifest.static = sync_static(
+            dir_path_static,
+            dir_path_public,
+            previous=manifest.static,
+            use_hash=args.hash_static,
+            mode=args.copy_mode,
+            fingerprint=args.fingerprint,
+            hash_cache=hash_cache,
+            stats=static_stats,
+            keep=keep,
+        )
+    else:
+        print("Deleting public directory...")
+        print("Copying static files to public directory...")
+        copy_static(
+            dir_path_static,
+            dir_path_public,
+            mode=args.copy_mode,
+            fingerprint=args.fingerprint,
+            hash_cache=hash_cache,
+            stats=static_stats,
+        )
+
+    if hash_cache is not None:
+        hash_cache.save()
+        assets = load_asset_manifest(os.path.join(dir_path_public, ASSET_MANIFEST_NAME))
 
     print(base_path)
 
     print("Generating page...")
-    generate_pages_recursive(
-        dir_path_content,
-        template_path,
-        dir_path_public,
-        base_path,
-    )
+    try:
+        results = generate_pages_recursive(
+            dir_path_content,
+            template_path,
+            dir_path_public,
+            base_path,
+            jobs=args.jobs,
+            manifest=manifest,
+            assets=assets,
+            cache=parse_cache,
+            measure=report is not None,
+        )
+        if report is not None:
+            report.add_pages(results)
+    except PageGenerationError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        if not args.watch:
+            sys.exit(1)
+    finally:
+        if manifest is not None:
+            manifest.save()
+        if parse_cache is not None:
+            parse_cache.evict()
+
+    if memo is not None:
+        if args.jobs > 1:
+            print("inline memo stats are kept per worker process and not reported with --jobs")
+        else:
+            print(memo)
+
+    gzip_record = None
+    if args.gzip:
+        print("Compressing public directory...")
+        gzip_record = SidecarRecord.load(os.path.join(args.cache_dir, "gzip-sidecars.json"))
+        with profiler.stage("compress"):
+            compress_tree(
+                dir_path_public, min_size=args.gzip_min_size, record=gzip_record, static_dir=dir_path_static
+            )
+
+    if build_profiler is not None:
+        profiler.set_profiler(None)
+        print(build_profiler.report())
+
+    if report is not None:
+        report.finish()
+        report.write(args.report)
+        print(f"Wrote build report to {args.report}")
+
+    if args.watch:
+        if memo is not None:
+            memo.clear()
+        watcher = Watcher(
+            dir_path_content,
+            dir_path_static,
+            template_path,
+            dir_path_public,
+            base_path,
+            copy_mode=args.copy_mode,
+            gzip_record=gzip_record,
+            gzip_min_size=args.gzip_min_size,
+        )
+        watcher.run()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,81 +1,143 @@
-from block_markdown import markdown_to_blocks, block_to_block_type, BlockType
+import io
+
+import profiler
+from block_markdown import iter_block_lines, BlockType
 from inline_markdown import text_to_textnodes
-from textnode import text_node_to_html_node
-from htmlnode import ParentNode, LeafNode
+from textnode import text_node_to_html_node, text_nodes_to_html
+from htmlnode import ParentNode, LeafNode, RawHTMLNode
+
+class ParsedDocument:
+    def __init__(self, node, title, headings, word_count):
+        self.node = node
+        self.title = title
+        self.headings = headings
+        self.word_count = word_count
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, ParsedDocument) and
+            self.node.to_html() == other.node.to_html() and
+            self.title == other.title and
+            self.headings == other.headings and
+            self.word_count == other.word_count
+        )
+
+    def __repr__(self):
+        return f"ParsedDocument({self.title}, {self.headings}, {self.word_count})"
+
+def _to_lines(markdown):
+    return io.StringIO(markdown) if isinstance(markdown, str) else markdown
 
 def extract_title(markdown):
-    blocks = markdown_to_blocks(markdown)
+    for block_lines, block_type in iter_block_lines(_to_lines(markdown)):
+        if block_type == BlockType.HEADING and block_lines[0].startswith("# "):
+            return "\n".join(block_lines)[2:].strip()
+
+    raise Exception("No h1 header found")
 
-    for block in blocks:
-        block_type = block_to_block_type(block)
+def parse_markdown(markdown, to_children=None, blocks=None):
+    if profiler.active is not None:
+        with profiler.active.stage("block parse"):
+            return _parse_markdown(markdown, to_children, blocks)
+    return _parse_markdown(markdown, to_children, blocks)
+
+def _parse_markdown(markdown, to_children, blocks):
+    if to_children is None:
+        to_children = text_to_inline_html
+    per_block = []
+    title = None
+    headings = []
+    word_count = 0
+    for block_lines, block_type in iter_block_lines(_to_lines(markdown)):
+        word_count += count_words(block_lines, block_type)
         if block_type == BlockType.HEADING:
-            if block.startswith("# "):
-                return block[2:].strip()
+            level, text = split_heading(block_lines)
+            headings.append((level, text))
+            if title is None and level == 1:
+                title = text.strip()
+        if blocks is None:
+            per_block.append(block_converters[block_type](block_lines, to_children))
+        else:
+            per_block.append(blocks.render(block_lines, block_converters[block_type], to_children))
+    return ParsedDocument(ParentNode("div", per_block), title, headings, word_count)
 
-    raise Exception("No h1 header found")
+def iter_block_nodes(markdown, to_children=None):
+    if to_children is None:
+        to_children = text_to_inline_html
+    for block_lines, block_type in iter_block_lines(_to_lines(markdown)):
+        yield block_converters[block_type](block_lines, to_children)
+
+class StreamedDocument:
+    def __init__(self, markdown, to_children=None):
+        self.markdown = markdown
+        self.to_children = to_children
+
+    def write_html(self, fp):
+        fp.write("<div>")
+        for node in iter_block_nodes(self.markdown, self.to_children):
+            node.write_html(fp)
+        fp.write("</div>")
+
+    def __repr__(self):
+        return f"StreamedDocument({self.markdown!r})"
 
 def markdown_to_html_node(markdown):
-    blocks = markdown_to_blocks(markdown)
-    per_block = []
+    return parse_markdown(markdown, text_to_children).node
 
-    for block in blocks:
-        block_type = block_to_block_type(block)
-
-        if block_type == BlockType.PARAGRAPH:
-            text_nodes = text_to_textnodes(block)
-            children = [text_node_to_html_node(text_node) for text_node in text_nodes]
-            per_block.append(ParentNode("p", children))
-        
-        if block_type == BlockType.CODE:
-            lines = block.split("\n")
-            inner_lines = lines[1:-1]
-            inner_text = "\n".join(inner_lines) + "\n"
-            code_node = LeafNode("code", inner_text)
-            per_block.append(ParentNode("pre", [code_node]))
-        
-        if block_type == BlockType.HEADING:
-            tokens, text = (block.split(maxsplit=1) + [""])[:2]
-            num_headings = len(tokens) if set(tokens) == {"#"} and 1 <= len(tokens) <= 6 else 1
-            text_nodes = text_to_textnodes(text)
-            children = [text_node_to_html_node(text_node) for text_node in text_nodes]
-            per_block.append(ParentNode(f"h{num_headings}", children))
-        
-        if block_type == BlockType.UNORDERED_LIST:
-            li_nodes = []
-            for line in block.splitlines():
-                if line.startswith("- ") or line.startswith("* "):
-                    item_text = line[2:]
-                    text_nodes = text_to_textnodes(item_text)
-                    li_children = [text_node_to_html_node(tn) for tn in text_nodes]
-                    li_nodes.append(ParentNode("li", li_children))
-            per_block.append(ParentNode("ul", li_nodes))
-        
-        if block_type == BlockType.ORDERED_LIST:
-            li_nodes = []
-            for line in block.splitlines():
-                i = 0
-                while i < len(line) and line[i].isdigit():
-                    i += 1
-                if i > 0 and line[i:i+2] == ". ":
-                    item_text = line[i+2:]
-                    text_nodes = text_to_textnodes(item_text)
-                    li_children = [text_node_to_html_node(tn) for tn in text_nodes]
-                    li_nodes.append(ParentNode("li", li_children))
-            per_block.append(ParentNode("ol", li_nodes))
-
-        if block_type == BlockType.QUOTE:
-            lines = block.splitlines()
-            quote_lines = []
-            for line in lines:
-                if line.startswith("> "):
-                    quote_lines.append(line[2:])
-                elif line == ">":
-                    quote_lines.append("")
-            text = "\n".join(quote_lines)
-            text_nodes = text_to_textnodes(text)
-            children = [text_node_to_html_node(tn) for tn in text_nodes]
-            per_block.append(ParentNode("blockquote", children))
-                    
-
-
-    return ParentNode("div", per_block)
\ No newline at end of file
+def split_heading(lines):
+    block = "\n".join(lines)
+    level = len(block) - len(block.lstrip("#"))
+    return level, block[level:].lstrip()
+
+def count_words(lines, block_type):
+    if block_type == BlockType.HEADING:
+        return len(split_heading(lines)[1].split())
+    if block_type == BlockType.CODE:
+        lines = lines[1:-1]
+    elif block_type == BlockType.QUOTE:
+        lines = [line[1:] for line in lines]
+    elif block_type == BlockType.UNORDERED_LIST:
+        lines = [line[2:] for line in lines]
+    elif block_type == BlockType.ORDERED_LIST:
+        lines = [line[len(str(i)) + 2:] for i, line in enumerate(lines, 1)]
+    return sum(len(line.split()) for line in lines)
+
+def text_to_children(text):
+    return [text_node_to_html_node(text_node) for text_node in text_to_textnodes(text)]
+
+def text_to_inline_html(text):
+    return [RawHTMLNode(text_nodes_to_html(text_to_textnodes(text)))]
+
+def paragraph_to_html_node(lines, to_children=text_to_children):
+    return ParentNode("p", to_children("\n".join(lines)))
+
+def heading_to_html_node(lines, to_children=text_to_children):
+    level, text = split_heading(lines)
+    return ParentNode(f"h{level}", to_children(text))
+
+def code_to_html_node(lines, to_children=text_to_children):
+    inner_text = "\n".join(lines[1:-1]) + "\n"
+    return ParentNode("pre", [LeafNode("code", inner_text)])
+
+def quote_to_html_node(lines, to_children=text_to_children):
+    text = "\n".join(line[2:] for line in lines)
+    return ParentNode("blockquote", to_children(text))
+
+def unordered_list_to_html_node(lines, to_children=text_to_children):
+    return ParentNode("ul", [ParentNode("li", to_children(line[2:])) for line in lines])
+
+def ordered_list_to_html_node(lines, to_children=text_to_children):
+    li_nodes = []
+    for i, line in enumerate(lines, 1):
+        item_text = line[len(str(i)) + 2:]
+        li_nodes.append(ParentNode("li", to_children(item_text)))
+    return ParentNode("ol", li_nodes)
+
+block_converters = {
+    BlockType.PARAGRAPH: paragraph_to_html_node,
+    BlockType.HEADING: heading_to_html_node,
+    BlockType.CODE: code_to_html_node,
+    BlockType.QUOTE: quote_to_html_node,
+    BlockType.UNORDERED_LIST: unordered_list_to_html_node,
+    BlockType.ORDERED_LIST: ordered_list_to_html_node,
+}
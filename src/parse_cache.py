@@ -0,0 +1,145 @@
+import io
+import marshal
+import os
+
+import profiler
+from build_manifest import hash_bytes
+from htmlnode import RawHTMLNode
+from markdown_to_html import ParsedDocument, parse_markdown
+
+PARSER_VERSION = 2
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class BlockMemo:
+    def __init__(self, previous=None):
+        self.previous = previous or {}
+        self.current = {}
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, block_lines, convert, to_children):
+        key = hash_bytes("\n".join(block_lines).encode())
+        html = self.current.get(key)
+        if html is None:
+            html = self.previous.get(key)
+        if html is None:
+            html = convert(block_lines, to_children).to_html()
+            self.misses += 1
+        else:
+            self.hits += 1
+        self.current[key] = html
+        return RawHTMLNode(html)
+
+    def __repr__(self):
+        return f"BlockMemo({self.hits} hits, {self.misses} misses)"
+
+
+class ParseCache:
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def key(self, source):
+        return hash_bytes(f"parser-{PARSER_VERSION}:".encode() + source)
+
+    def entry_path(self, key):
+        return os.path.join(self.cache_dir, key + ".marshal")
+
+    def get(self, source):
+        path = self.entry_path(self.key(source))
+        try:
+            with open(path, "rb") as f:
+                html, title, headings, word_count = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return ParsedDocument(RawHTMLNode(html), title, [tuple(h) for h in headings], word_count)
+
+    def put(self, source, parsed):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.entry_path(self.key(source))
+        html = parsed.node.to_html()
+        data = (html, parsed.title, parsed.headings, parsed.word_count)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            marshal.dump(data, f)
+        os.replace(tmp_path, path)
+        return ParsedDocument(RawHTMLNode(html), parsed.title, parsed.headings, parsed.word_count)
+
+    def blocks_path(self, from_path):
+        key = hash_bytes(f"parser-{PARSER_VERSION}:{from_path}".encode())
+        return os.path.join(self.cache_dir, f"blocks-{key}.marshal")
+
+    def load_blocks(self, from_path):
+        try:
+            with open(self.blocks_path(from_path), "rb") as f:
+                blocks = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return {}
+        return blocks if isinstance(blocks, dict) else {}
+
+    def save_blocks(self, from_path, blocks):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.blocks_path(from_path)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            marshal.dump(blocks, f)
+        os.replace(tmp_path, path)
+
+    def parse(self, source, from_path=None, stats=None):
+        with profiler.stage("parse cache"):
+            parsed = self.get(source)
+        if parsed is not None:
+            if stats is not None:
+                stats["parse_cache"] = "hit"
+            return parsed
+
+        memo = None
+        if from_path is not None:
+            with profiler.stage("parse cache"):
+                memo = BlockMemo(self.load_blocks(from_path))
+        parsed = parse_markdown(io.TextIOWrapper(io.BytesIO(source)), blocks=memo)
+        with profiler.stage("parse cache"):
+            parsed = self.put(source, parsed)
+            if memo is not None:
+                self.save_blocks(from_path, memo.current)
+        if stats is not None:
+            stats["parse_cache"] = "miss"
+            if memo is not None:
+                stats["block_hits"] = memo.hits
+                stats["block_misses"] = memo.misses
+        return parsed
+
+    def evict(self):
+        try:
+            with os.scandir(self.cache_dir) as it:
+                entries = [entry for entry in it if entry.name.endswith(".marshal")]
+        except FileNotFoundError:
+            return []
+        stats = [(entry.stat(), entry.path) for entry in entries]
+        total = sum(st.st_size for st, _ in stats)
+        removed = []
+        for st, path in sorted(stats, key=lambda item: item[0].st_mtime_ns):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= st.st_size
+            removed.append(path)
+        return removed
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, ParseCache) and
+            self.cache_dir == other.cache_dir and
+            self.max_bytes == other.max_bytes
+        )
+
+    def __repr__(self):
+        return f"ParseCache({self.cache_dir}, {self.max_bytes})"
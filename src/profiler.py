@@ -0,0 +1,84 @@
+import time
+from contextlib import nullcontext
+
+active = None
+_no_stage = nullcontext()
+
+
+def set_profiler(profiler):
+    global active
+    previous = active
+    active = profiler
+    return previous
+
+def stage(name):
+    if active is None:
+        return _no_stage
+    return active.stage(name)
+
+
+class _Stage:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler.start(self.name)
+
+    def __exit__(self, *exc_info):
+        self.profiler.stop()
+
+
+class Profiler:
+    def __init__(self):
+        self.stages = {}
+        self.pages = []
+        self._stack = []
+
+    def stage(self, name):
+        return _Stage(self, name)
+
+    def start(self, name):
+        now = time.perf_counter()
+        if self._stack:
+            self._charge(self._stack[-1][0], now - self._stack[-1][1], 0)
+        self._stack.append([name, now])
+
+    def stop(self):
+        now = time.perf_counter()
+        name, started = self._stack.pop()
+        self._charge(name, now - started, 1)
+        if self._stack:
+            self._stack[-1][1] = now
+
+    def _charge(self, name, elapsed, calls):
+        totals = self.stages.get(name)
+        if totals is None:
+            self.stages[name] = [elapsed, calls]
+        else:
+            totals[0] += elapsed
+            totals[1] += calls
+
+    def merge(self, stages):
+        for name, (elapsed, calls) in stages.items():
+            self._charge(name, elapsed, calls)
+
+    def add_page(self, from_path, elapsed):
+        self.pages.append((elapsed, from_path))
+
+    def report(self, slowest=5):
+        total = sum(elapsed for elapsed, _ in self.stages.values())
+        lines = [f"{'stage':<14} {'total ms':>10} {'calls':>8} {'share':>7}"]
+        ranked = sorted(self.stages.items(), key=lambda item: item[1][0], reverse=True)
+        for name, (elapsed, calls) in ranked:
+            share = elapsed / total if total else 0.0
+            lines.append(f"{name:<14} {elapsed * 1000:10.1f} {calls:8d} {share:7.1%}")
+        lines.append(f"{'total':<14} {total * 1000:10.1f}")
+        if self.pages:
+            lines.append("slowest pages:")
+            for elapsed, from_path in sorted(self.pages, reverse=True)[:slowest]:
+                lines.append(f"  {elapsed * 1000:8.1f} ms  {from_path}")
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return f"Profiler({len(self.stages)} stages, {len(self.pages)} pages)"
@@ -0,0 +1,102 @@
+import os
+import re
+
+from htmlnode import escape_text
+
+TITLE_PLACEHOLDER = "{{ Title }}"
+CONTENT_PLACEHOLDER = "{{ Content }}"
+
+_slots = {
+    TITLE_PLACEHOLDER: "title",
+    CONTENT_PLACEHOLDER: "content",
+}
+
+_url_attr_pattern = re.compile(r'(href|src)="(/[^"]*)"')
+
+
+def rewrite_urls(text, base_path, assets=None):
+    if assets:
+        text = _url_attr_pattern.sub(
+            lambda m: f'{m.group(1)}="{assets.get(m.group(2), m.group(2))}"',
+            text,
+        )
+    if base_path == "/":
+        return text
+    return text.replace('href="/', f'href="{base_path}').replace('src="/', f'src="{base_path}')
+
+
+class _UrlRewritingWriter:
+    def __init__(self, fp, base_path, assets=None):
+        self.fp = fp
+        self.base_path = base_path
+        self.assets = assets
+
+    def write(self, text):
+        self.fp.write(rewrite_urls(text, self.base_path, self.assets))
+
+
+class Template:
+    def __init__(self, text, base_path="/", assets=None):
+        self.text = text
+        self.base_path = base_path
+        self.assets = assets or {}
+        self.static_parts = []
+        self.slots = []
+        rest = text
+        while True:
+            found = [(rest.find(p), p) for p in _slots if p in rest]
+            if not found:
+                break
+            index, placeholder = min(found)
+            self.static_parts.append(rewrite_urls(rest[:index], base_path, self.assets))
+            self.slots.append(_slots[placeholder])
+            rest = rest[index + len(placeholder):]
+        self.static_parts.append(rewrite_urls(rest, base_path, self.assets))
+
+    @classmethod
+    def from_file(cls, template_path, base_path="/", assets=None):
+        if not os.path.exists(template_path):
+            raise FileNotFoundError(f"Template file not found: {template_path}")
+        _, ext = os.path.splitext(template_path)
+        if ext.lower() != ".html":
+            raise ValueError(f"Expected a .html file, got: {ext}")
+        with open(template_path, "r") as f:
+            return cls(f.read(), base_path, assets)
+
+    def render_parts(self, title, content):
+        values = {
+            "title": rewrite_urls(escape_text(title), self.base_path, self.assets),
+            "content": rewrite_urls(content, self.base_path, self.assets),
+        }
+        parts = [self.static_parts[0]]
+        for slot, static in zip(self.slots, self.static_parts[1:]):
+            parts.append(values[slot])
+            parts.append(static)
+        return parts
+
+    def render(self, title, content):
+        return "".join(self.render_parts(title, content))
+
+    def write(self, fp, title, content_node):
+        if self.base_path == "/" and not self.assets:
+            out = fp
+        else:
+            out = _UrlRewritingWriter(fp, self.base_path, self.assets)
+        fp.write(self.static_parts[0])
+        for slot, static in zip(self.slots, self.static_parts[1:]):
+            if slot == "title":
+                out.write(escape_text(title))
+            else:
+                content_node.write_html(out)
+            fp.write(static)
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, Template) and
+            self.text == other.text and
+            self.base_path == other.base_path and
+            self.assets == other.assets
+        )
+
+    def __repr__(self):
+        return f"Template({self.slots}, {self.base_path})"
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+
+from assets import AssetHashCache, fingerprint_path, asset_url
+
+
+class TestAssets(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "index.css")
+        with open(self.path, "w") as f:
+            f.write("body {}")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_fingerprint_path(self):
+        self.assertEqual(fingerprint_path("index.css", "3f2a9c0011223344"), "index.3f2a9c00.css")
+        self.assertEqual(
+            fingerprint_path(os.path.join("images", "tom.png"), "abcdef0123456789"),
+            os.path.join("images", "tom.abcdef01.png"),
+        )
+
+    def test_asset_url(self):
+        self.assertEqual(asset_url(os.path.join("images", "tom.png")), "/images/tom.png")
+
+    def test_hash_cache_round_trip(self):
+        cache_path = os.path.join(self.tmp.name, "cache", "asset-hashes.json")
+        cache = AssetHashCache(cache_path)
+        digest = cache.hash(self.path)
+        cache.save()
+        self.assertEqual(AssetHashCache.load(cache_path).entries, cache.entries)
+        self.assertEqual(AssetHashCache.load(cache_path).hash(self.path), digest)
+
+    def test_hash_cache_rehashes_changed_file(self):
+        cache = AssetHashCache()
+        digest = cache.hash(self.path)
+        with open(self.path, "w") as f:
+            f.write("body { color: red; }")
+        self.assertNotEqual(cache.hash(self.path), digest)
+
+    def test_hash_cache_load_corrupt(self):
+        cache_path = os.path.join(self.tmp.name, "asset-hashes.json")
+        with open(cache_path, "w") as f:
+            f.write("{not json")
+        self.assertEqual(AssetHashCache.load(cache_path).entries, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
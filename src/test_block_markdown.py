@@ -1,5 +1,6 @@
+import io
 import unittest
-from block_markdown import markdown_to_blocks, block_to_block_type, BlockType
+from block_markdown import markdown_to_blocks, block_to_block_type, lines_to_block_type, iter_blocks, BlockType
 
 class TestMarkdownToBlocks(unittest.TestCase):
     def test_markdown_to_blocks(self):
@@ -195,6 +196,63 @@ Third block"""
         )
 
 
+    def test_fenced_code_with_blank_lines(self):
+        md = "Intro\n\n```python\ndef hello():\n\n    return 1\n```\n\nOutro"
+        blocks = markdown_to_blocks(md)
+        self.assertEqual(
+            blocks,
+            [
+                "Intro",
+                "```python\ndef hello():\n\nreturn 1\n```",
+                "Outro"
+            ]
+        )
+
+    def test_whitespace_only_multiline_block_dropped(self):
+        md = "First\n\n \n\t\n\nSecond"
+        blocks = markdown_to_blocks(md)
+        self.assertEqual(blocks, ["First", "Second"])
+
+
+class TestIterBlocks(unittest.TestCase):
+
+    def test_yields_block_types(self):
+        lines = ["# Title", "", "- one", "- two", "", "```", "", "code", "```"]
+        self.assertEqual(
+            list(iter_blocks(lines)),
+            [
+                ("# Title", BlockType.HEADING),
+                ("- one\n- two", BlockType.UNORDERED_LIST),
+                ("```\n\ncode\n```", BlockType.CODE),
+            ]
+        )
+
+    def test_reads_from_file_object(self):
+        fp = io.StringIO("# Title\n\nSome text\nmore text\n\n> quote\n")
+        self.assertEqual(
+            list(iter_blocks(fp)),
+            [
+                ("# Title", BlockType.HEADING),
+                ("Some text\nmore text", BlockType.PARAGRAPH),
+                ("> quote", BlockType.QUOTE),
+            ]
+        )
+
+    def test_is_lazy(self):
+        def lines():
+            yield "First block"
+            yield ""
+            raise AssertionError("read past the first block")
+        blocks = iter_blocks(lines())
+        self.assertEqual(next(blocks), ("First block", BlockType.PARAGRAPH))
+
+    def test_unclosed_fence_runs_to_end(self):
+        lines = ["```", "code", "", "more"]
+        self.assertEqual(
+            list(iter_blocks(lines)),
+            [("```\ncode\n\nmore", BlockType.PARAGRAPH)]
+        )
+
 class TestBlockToBlockType(unittest.TestCase):
 
     def test_paragraph_block(self):
@@ -345,6 +403,10 @@ class TestBlockToBlockType(unittest.TestCase):
         block = "This has - dash in middle"
         self.assertEqual(block_to_block_type(block), BlockType.PARAGRAPH)
 
+    def test_lines_to_block_type_matches_block(self):
+        for block in ("# h", "```\nx\n```", "> a\n>", "- a\n- b", "1. a\n2. b", "1. a\n3. b", "p"):
+            self.assertEqual(lines_to_block_type(block.split("\n")), block_to_block_type(block))
+
     def test_edge_case_greater_than_in_middle(self):
         block = "This has > symbol in middle"
         self.assertEqual(block_to_block_type(block), BlockType.PARAGRAPH)
@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+
+from build_manifest import BuildManifest
+
+
+class TestBuildManifest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.source = os.path.join(self.root, "page.md")
+        self.dest = os.path.join(self.root, "page.html")
+        self.template = os.path.join(self.root, "template.html")
+        self.manifest_path = os.path.join(self.root, "cache", "manifest.json")
+        self.write(self.source, "# Page")
+        self.write(self.dest, "<h1>Page</h1>")
+        self.write(self.template, "{{ Content }}")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, text):
+        with open(path, "w") as f:
+            f.write(text)
+
+    def template_text(self):
+        with open(self.template) as f:
+            return f.read()
+
+    def recorded_manifest(self):
+        manifest = BuildManifest(self.manifest_path)
+        manifest.start_build(self.template_text(), "/")
+        manifest.record(self.source, self.dest)
+        manifest.save()
+        return BuildManifest.load(self.manifest_path)
+
+    def test_unrecorded_page_is_stale(self):
+        manifest = BuildManifest.load(self.manifest_path)
+        manifest.start_build(self.template_text(), "/")
+        self.assertFalse(manifest.is_fresh(self.source, self.dest))
+
+    def test_recorded_page_is_fresh(self):
+        manifest = self.recorded_manifest()
+        manifest.start_build(self.template_text(), "/")
+        self.assertTrue(manifest.is_fresh(self.source, self.dest))
+
+    def test_changed_source_is_stale(self):
+        manifest = self.recorded_manifest()
+        self.write(self.source, "# Changed page")
+        manifest.start_build(self.template_text(), "/")
+        self.assertFalse(manifest.is_fresh(self.source, self.dest))
+
+    def test_touched_source_with_same_content_is_fresh(self):
+        manifest = self.recorded_manifest()
+        st = os.stat(self.source)
+        os.utime(self.source, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        manifest.start_build(self.template_text(), "/")
+        self.assertTrue(manifest.is_fresh(self.source, self.dest))
+
+    def test_missing_output_is_stale(self):
+        manifest = self.recorded_manifest()
+        os.remove(self.dest)
+        manifest.start_build(self.template_text(), "/")
+        self.assertFalse(manifest.is_fresh(self.source, self.dest))
+
+    def test_template_change_invalidates_pages(self):
+        manifest = self.recorded_manifest()
+        self.write(self.template, "<main>{{ Content }}</main>")
+        manifest.start_build(self.template_text(), "/")
+        self.assertFalse(manifest.is_fresh(self.source, self.dest))
+
+    def test_base_path_change_invalidates_pages(self):
+        manifest = self.recorded_manifest()
+        manifest.start_build(self.template_text(), "/blog/")
+        self.assertFalse(manifest.is_fresh(self.source, self.dest))
+
+    def test_prune_returns_removed_outputs(self):
+        manifest = self.recorded_manifest()
+        self.assertEqual(manifest.prune([]), [self.dest])
+        self.assertEqual(manifest.pages, {})
+
+    def test_template_change_still_prunes_deleted_pages(self):
+        manifest = self.recorded_manifest()
+        self.write(self.template, "<main>{{ Content }}</main>")
+        manifest.start_build(self.template_text(), "/")
+        self.assertEqual(manifest.prune([]), [self.dest])
+
+    def test_corrupt_manifest_is_ignored(self):
+        os.makedirs(os.path.dirname(self.manifest_path))
+        self.write(self.manifest_path, "{not json")
+        manifest = BuildManifest.load(self.manifest_path)
+        self.assertEqual(manifest.pages, {})
+        self.assertIsNone(manifest.static)
+
+
+if __name__ == "__main__":
+    unittest.main()
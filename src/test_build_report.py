@@ -0,0 +1,76 @@
+import json
+import os
+import tempfile
+import unittest
+
+from build_report import BuildReport
+from generate_page import generate_pages_recursive
+
+
+class TestBuildReport(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.dest = os.path.join(self.tmp.name, "docs")
+        self.template = os.path.join(self.tmp.name, "template.html")
+        with open(self.template, "w") as f:
+            f.write("<title>{{ Title }}</title>{{ Content }}")
+        os.makedirs(self.content)
+        with open(os.path.join(self.content, "index.md"), "w") as f:
+            f.write("# Home\n\nHéllo **world**")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_measured_pages_record_sizes_and_timings(self):
+        results = generate_pages_recursive(self.content, self.template, self.dest, "/", measure=True)
+        report = BuildReport()
+        report.add_pages(results)
+        page = report.pages[0]
+
+        output_path = os.path.join(self.dest, "index.html")
+        self.assertEqual(page["source"], os.path.join(self.content, "index.md"))
+        self.assertEqual(page["output"], output_path)
+        self.assertEqual(page["input_bytes"], len("# Home\n\nHéllo **world**".encode()))
+        self.assertEqual(page["output_bytes"], os.path.getsize(output_path))
+        for key in ("parse_ms", "render_ms", "write_ms"):
+            self.assertGreaterEqual(page[key], 0)
+        self.assertIsNone(page["cache"])
+
+    def test_measured_output_matches_streamed_output(self):
+        generate_pages_recursive(self.content, self.template, self.dest, "/site/")
+        with open(os.path.join(self.dest, "index.html")) as f:
+            streamed = f.read()
+        generate_pages_recursive(self.content, self.template, self.dest, "/site/", measure=True)
+        with open(os.path.join(self.dest, "index.html")) as f:
+            self.assertEqual(f.read(), streamed)
+
+    def test_write_json(self):
+        report = BuildReport("/site/")
+        report.add_pages([
+            {"source": "a.md", "output": "a.html", "input_bytes": 10, "output_bytes": 30,
+             "parse_ms": 1.23456, "render_ms": 0.5, "write_ms": 0.25, "parse_cache": "hit"},
+            {"source": "b.md", "output": "b.html", "input_bytes": 5, "output_bytes": 20,
+             "parse_ms": 2.0, "render_ms": 0.5, "write_ms": 0.25, "parse_cache": "miss"},
+        ])
+        report.static.update({"files": 2, "copied": 1, "copied_bytes": 100, "ms": 0.5})
+        report.finish()
+        path = os.path.join(self.tmp.name, "reports", "build-report.json")
+        report.write(path)
+
+        with open(path) as f:
+            data = json.load(f)
+        self.assertEqual(data["base_path"], "/site/")
+        self.assertEqual(
+            data["totals"],
+            {"pages": 2, "input_bytes": 15, "output_bytes": 50, "cache_hits": 1},
+        )
+        self.assertEqual(data["pages"][0]["parse_ms"], 1.235)
+        self.assertEqual(data["static"]["copied"], 1)
+        self.assertGreaterEqual(data["wall_ms"], 0)
+        self.assertGreaterEqual(data["cpu_ms"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
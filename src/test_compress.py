@@ -0,0 +1,111 @@
+import gzip
+import os
+import tempfile
+import unittest
+
+from compress import SidecarRecord, compress_file, compress_tree
+
+
+class TestCompressTree(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.write("index.html", "<p>hello</p>" * 200)
+        self.write("blog/post.html", "<p>post</p>" * 200)
+        self.write("index.css", "body { margin: 0; }" * 100)
+        self.write("tiny.html", "<p>hi</p>")
+        self.write("images/photo.png", "x" * 4096)
+        self.cache = tempfile.TemporaryDirectory()
+        self.record_path = os.path.join(self.cache.name, "gzip-sidecars.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+        self.cache.cleanup()
+
+    def compress(self):
+        return compress_tree(self.root, min_size=1024, record=SidecarRecord.load(self.record_path))
+
+    def path(self, rel_path):
+        return os.path.join(self.root, rel_path)
+
+    def write(self, rel_path, text):
+        path = self.path(rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+
+    def test_writes_sidecars_for_compressible_files(self):
+        self.compress()
+        for rel_path in ("index.html", os.path.join("blog", "post.html"), "index.css"):
+            with gzip.open(self.path(rel_path) + ".gz", "rb") as f:
+                with open(self.path(rel_path), "rb") as original:
+                    self.assertEqual(f.read(), original.read())
+
+    def test_skips_small_and_incompressible_files(self):
+        self.compress()
+        self.assertFalse(os.path.exists(self.path("tiny.html.gz")))
+        self.assertFalse(os.path.exists(self.path("images/photo.png.gz")))
+
+    def test_skips_up_to_date_sidecars(self):
+        self.assertEqual(len(self.compress()), 3)
+        self.assertEqual(self.compress(), [])
+
+        self.write("index.css", "body { margin: 1px; }" * 100)
+        sidecar = self.path("index.css.gz")
+        st = os.stat(sidecar)
+        os.utime(sidecar, ns=(st.st_atime_ns, st.st_mtime_ns - 10**9))
+        self.assertEqual(self.compress(), [self.path("index.css")])
+
+    def test_removes_orphaned_sidecars(self):
+        self.compress()
+        os.remove(self.path("index.css"))
+        self.compress()
+        self.assertFalse(os.path.exists(self.path("index.css.gz")))
+
+    def test_keeps_gz_files_copied_from_static(self):
+        static = os.path.join(self.cache.name, "static")
+        for rel_path, text in (("data.tar.gz", "archive"), ("app.js", "let x = 1;" * 200), ("app.js.gz", "prebuilt")):
+            self.write(rel_path, text)
+            os.makedirs(static, exist_ok=True)
+            with open(os.path.join(static, rel_path), "w") as f:
+                f.write(text)
+        for _ in range(2):
+            compress_tree(self.root, min_size=1024, record=SidecarRecord.load(self.record_path), static_dir=static)
+        with open(self.path("data.tar.gz")) as f:
+            self.assertEqual(f.read(), "archive")
+        with open(self.path("app.js.gz")) as f:
+            self.assertEqual(f.read(), "prebuilt")
+
+    def test_refreshes_older_sidecars_without_a_record(self):
+        self.compress()
+        os.remove(self.record_path)
+        self.write("index.css", "body { margin: 1px; }" * 100)
+        sidecar = self.path("index.css.gz")
+        st = os.stat(sidecar)
+        os.utime(sidecar, ns=(st.st_atime_ns, st.st_mtime_ns - 10**9))
+        self.assertEqual(self.compress(), [self.path("index.css")])
+        with gzip.open(sidecar, "rb") as f:
+            self.assertEqual(f.read(), b"body { margin: 1px; }" * 100)
+
+    def test_recompresses_when_size_changes_with_older_mtime(self):
+        self.compress()
+        st = os.stat(self.path("index.css"))
+        self.write("index.css", "body { padding: 0; }" * 100)
+        os.utime(self.path("index.css"), ns=(st.st_atime_ns, st.st_mtime_ns - 10**9))
+        self.assertEqual(self.compress(), [self.path("index.css")])
+        with gzip.open(self.path("index.css.gz"), "rb") as f:
+            self.assertEqual(f.read(), b"body { padding: 0; }" * 100)
+
+    def test_compress_file_is_reproducible(self):
+        path = self.path("index.html")
+        compress_file(path)
+        with open(path + ".gz", "rb") as f:
+            first = f.read()
+        compress_file(path)
+        with open(path + ".gz", "rb") as f:
+            self.assertEqual(f.read(), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+import json
+import os
+import tempfile
+import unittest
+
+from assets import AssetHashCache
+from build_manifest import hash_bytes
+from copystatic import copy_static, sync_static, copy_file, copy_files
+
+
+class TestCopyStatic(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmp.name, "static")
+        self.dest = os.path.join(self.tmp.name, "docs")
+        self.write(self.source, "index.css", "body {}")
+        self.write(self.source, "images/logo.png", "png bytes")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, root, rel_path, text):
+        path = os.path.join(root, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+
+    def read(self, rel_path):
+        with open(os.path.join(self.dest, rel_path)) as f:
+            return f.read()
+
+    def test_copy_static_replaces_destination(self):
+        self.write(self.dest, "old.html", "old")
+        copy_static(self.source, self.dest)
+        self.assertEqual(sorted(os.listdir(self.dest)), ["images", "index.css"])
+        self.assertEqual(self.read("images/logo.png"), "png bytes")
+
+    def test_copy_static_missing_source(self):
+        with self.assertRaises(FileNotFoundError):
+            copy_static(os.path.join(self.tmp.name, "missing"), self.dest)
+
+    def test_sync_copies_new_files(self):
+        synced = sync_static(self.source, self.dest)
+        self.assertEqual(synced, sorted(["index.css", os.path.join("images", "logo.png")]))
+        self.assertEqual(self.read("index.css"), "body {}")
+
+    def test_sync_skips_unchanged_files(self):
+        sync_static(self.source, self.dest)
+        dest_path = os.path.join(self.dest, "index.css")
+        st = os.stat(dest_path)
+        with open(dest_path, "w") as f:
+            f.write("EDITED!")
+        os.utime(dest_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        sync_static(self.source, self.dest)
+        self.assertEqual(self.read("index.css"), "EDITED!")
+
+    def test_sync_with_hash_detects_same_size_edit(self):
+        sync_static(self.source, self.dest)
+        dest_path = os.path.join(self.dest, "index.css")
+        with open(dest_path, "w") as f:
+            f.write("EDITED!")
+        st = os.stat(os.path.join(self.source, "index.css"))
+        os.utime(dest_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        sync_static(self.source, self.dest, use_hash=True)
+        self.assertEqual(self.read("index.css"), "body {}")
+
+    def test_sync_copies_changed_files(self):
+        sync_static(self.source, self.dest)
+        self.write(self.source, "index.css", "body { color: red; }")
+        sync_static(self.source, self.dest)
+        self.assertEqual(self.read("index.css"), "body { color: red; }")
+
+    def test_sync_removes_only_stale_outputs(self):
+        previous = sync_static(self.source, self.dest)
+        self.write(self.dest, "index.html", "<p>page</p>")
+        os.remove(os.path.join(self.source, "index.css"))
+        sync_static(self.source, self.dest, previous=previous)
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "index.css")))
+        self.assertEqual(self.read("index.html"), "<p>page</p>")
+        self.assertEqual(self.read("images/logo.png"), "png bytes")
+
+    def test_sync_without_previous_sweeps_destination(self):
+        self.write(self.dest, "index.html", "<p>page</p>")
+        self.write(self.dest, "old.html", "old")
+        self.write(self.dest, "images/old.png", "old png")
+        self.write(self.dest, "blog/old/index.html", "old post")
+        sync_static(self.source, self.dest, keep=["index.html"])
+        self.assertEqual(sorted(os.listdir(self.dest)), ["images", "index.css", "index.html"])
+        self.assertEqual(os.listdir(os.path.join(self.dest, "images")), ["logo.png"])
+
+    def test_sync_fingerprint_sweeps_unhashed_outputs(self):
+        copy_static(self.source, self.dest)
+        sync_static(self.source, self.dest, fingerprint=True)
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "index.css")))
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "images", "logo.png")))
+
+    def test_sync_removes_emptied_directories(self):
+        previous = sync_static(self.source, self.dest)
+        os.remove(os.path.join(self.source, "images", "logo.png"))
+        sync_static(self.source, self.dest, previous=previous)
+        self.assertEqual(os.listdir(self.dest), ["index.css"])
+
+    def test_copy_static_records_stats(self):
+        stats = {}
+        copy_static(self.source, self.dest, stats=stats)
+        self.assertEqual((stats["files"], stats["copied"]), (2, 2))
+        self.assertEqual(stats["copied_bytes"], len("body {}") + len("png bytes"))
+        self.assertEqual(stats["mode"], "copy")
+
+    def test_sync_records_only_changed_files(self):
+        sync_static(self.source, self.dest)
+        self.write(self.source, "index.css", "body { color: red; }")
+        stats = {}
+        sync_static(self.source, self.dest, stats=stats)
+        self.assertEqual((stats["files"], stats["copied"]), (2, 1))
+        self.assertEqual(stats["copied_bytes"], len("body { color: red; }"))
+
+    def test_copy_static_fingerprint(self):
+        digest = hash_bytes(b"body {}")[:8]
+        assets = copy_static(self.source, self.dest, fingerprint=True)
+        self.assertEqual(assets["/index.css"], f"/index.{digest}.css")
+        self.assertEqual(self.read(f"index.{digest}.css"), "body {}")
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "index.css")))
+        self.assertEqual(json.loads(self.read("asset-manifest.json")), assets)
+
+    def test_sync_fingerprint_replaces_old_name(self):
+        previous = sync_static(self.source, self.dest, fingerprint=True)
+        old_name = json.loads(self.read("asset-manifest.json"))["/index.css"]
+        self.write(self.source, "index.css", "body { color: red; }")
+        sync_static(self.source, self.dest, previous=previous, fingerprint=True)
+        new_name = json.loads(self.read("asset-manifest.json"))["/index.css"]
+        self.assertNotEqual(old_name, new_name)
+        self.assertFalse(os.path.exists(os.path.join(self.dest, old_name.lstrip("/"))))
+        self.assertEqual(self.read(new_name.lstrip("/")), "body { color: red; }")
+
+    def test_sync_without_fingerprint_removes_asset_manifest(self):
+        previous = sync_static(self.source, self.dest, fingerprint=True)
+        sync_static(self.source, self.dest, previous=previous)
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "asset-manifest.json")))
+
+    def test_fingerprint_hash_cache_skips_unchanged_files(self):
+        cache = AssetHashCache()
+        copy_static(self.source, self.dest, fingerprint=True, hash_cache=cache)
+        css_path = os.path.join(self.source, "index.css")
+        cache.entries[css_path][2] = "cached" + "0" * 58
+        assets = copy_static(self.source, self.dest, fingerprint=True, hash_cache=cache)
+        self.assertEqual(assets["/index.css"], "/index.cached00.css")
+
+    def test_copy_modes(self):
+        src_path = os.path.join(self.source, "index.css")
+        for mode in ("copy", "hardlink", "reflink"):
+            dest_path = os.path.join(self.tmp.name, f"{mode}.css")
+            copy_file(src_path, dest_path, mode)
+            with open(dest_path) as f:
+                self.assertEqual(f.read(), "body {}")
+            self.assertEqual(os.stat(dest_path).st_mtime_ns, os.stat(src_path).st_mtime_ns)
+
+    def test_hardlink_shares_inode(self):
+        src_path = os.path.join(self.source, "index.css")
+        dest_path = os.path.join(self.tmp.name, "linked.css")
+        copy_file(src_path, dest_path, "hardlink")
+        self.assertTrue(os.path.samefile(src_path, dest_path))
+
+    def test_copy_replaces_hardlinked_destination(self):
+        src_path = os.path.join(self.source, "index.css")
+        dest_path = os.path.join(self.tmp.name, "out.css")
+        copy_file(src_path, dest_path, "hardlink")
+        copy_file(os.path.join(self.source, "images", "logo.png"), dest_path, "copy")
+        with open(src_path) as f:
+            self.assertEqual(f.read(), "body {}")
+
+    def test_copy_files_in_parallel(self):
+        files = []
+        for i in range(20):
+            self.write(self.source, f"many/{i}.txt", f"file {i}" * i)
+            files.append((
+                os.path.join(self.source, "many", f"{i}.txt"),
+                os.path.join(self.tmp.name, f"{i}.txt"),
+            ))
+        copy_files(files, jobs=4)
+        for i, (_, dest_path) in enumerate(files):
+            with open(dest_path) as f:
+                self.assertEqual(f.read(), f"file {i}" * i)
+
+    def test_invalid_copy_mode(self):
+        with self.assertRaises(ValueError):
+            copy_files([], mode="symlink")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import os
+import tempfile
+import threading
+import unittest
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from devserver import DevSite, LRUCache, make_server, LIVE_RELOAD_SCRIPT
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+
+
+class SiteFixture:
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = self.tmp.name
+        self.content = os.path.join(root, "content")
+        self.static = os.path.join(root, "static")
+        self.template = os.path.join(root, "template.html")
+        self.write(self.template, "<html><body>{{ Content }}</body></html>")
+        self.write(os.path.join(self.content, "index.md"), "# Home")
+        self.write(os.path.join(self.content, "blog", "post", "index.md"), "# Post")
+        self.write(os.path.join(self.static, "index.css"), "body {}")
+        self.site = DevSite(self.content, self.static, self.template)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+
+
+class TestDevSite(SiteFixture, unittest.TestCase):
+
+    def test_resolve(self):
+        self.assertEqual(self.site.resolve("/"), ("page", os.path.join(self.content, "index.md")))
+        self.assertEqual(
+            self.site.resolve("/blog/post/"),
+            ("page", os.path.join(self.content, "blog", "post", "index.md")),
+        )
+        self.assertEqual(self.site.resolve("/index.css"), ("static", os.path.join(self.static, "index.css")))
+        self.assertIsNone(self.site.resolve("/missing"))
+        self.assertIsNone(self.site.resolve("/../template.html"))
+
+    def test_get_page_renders_with_live_reload(self):
+        body, _ = self.site.get_page(os.path.join(self.content, "index.md"))
+        self.assertEqual(
+            body.decode(),
+            f"<html><body><div><h1>Home</h1></div>{LIVE_RELOAD_SCRIPT}</body></html>",
+        )
+
+    def test_get_page_is_cached_until_source_changes(self):
+        from_path = os.path.join(self.content, "index.md")
+        _, etag = self.site.get_page(from_path)
+        self.assertEqual(self.site.get_page(from_path)[1], etag)
+        self.write(from_path, "# Home again")
+        self.assertNotEqual(self.site.get_page(from_path)[1], etag)
+
+    def test_poll_bumps_version(self):
+        self.assertFalse(self.site.poll())
+        self.write(os.path.join(self.content, "index.md"), "# Home changed")
+        self.assertTrue(self.site.poll())
+        self.assertEqual(self.site.wait_for_change(0, timeout=0), 1)
+
+    def test_watch_survives_failed_poll(self):
+        calls = []
+
+        def poll():
+            calls.append(1)
+            if len(calls) == 1:
+                raise FileNotFoundError("template.html")
+            raise KeyboardInterrupt
+
+        self.site.poll = poll
+        with self.assertRaises(KeyboardInterrupt):
+            self.site.watch(interval=0)
+        self.assertEqual(len(calls), 2)
+
+
+class TestDevServer(SiteFixture, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.server = make_server(self.site, port=0)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        super().tearDown()
+
+    def test_etag_not_modified(self):
+        with urlopen(self.base_url + "/") as response:
+            etag = response.headers["ETag"]
+            self.assertIn(b"<h1>Home</h1>", response.read())
+        request = Request(self.base_url + "/", headers={"If-None-Match": etag})
+        with self.assertRaises(HTTPError) as ctx:
+            urlopen(request)
+        self.assertEqual(ctx.exception.code, 304)
+
+    def test_render_error_with_unicode_path(self):
+        self.write(os.path.join(self.content, "blog", "Ωmega.md"), "no title here")
+        with self.assertRaises(HTTPError) as ctx:
+            urlopen(self.base_url + "/blog/%CE%A9mega.html")
+        self.assertEqual(ctx.exception.code, 500)
+        self.assertIn("Ωmega.md", ctx.exception.read().decode())
+
+    def test_not_found(self):
+        with self.assertRaises(HTTPError) as ctx:
+            urlopen(self.base_url + "/nope")
+        self.assertEqual(ctx.exception.code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
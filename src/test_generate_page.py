@@ -0,0 +1,172 @@
+import os
+import tempfile
+import unittest
+
+import parse_cache
+from build_manifest import BuildManifest
+from generate_page import cache_summary, find_pages, generate_pages_recursive, PageGenerationError
+from parse_cache import ParseCache
+
+
+TEMPLATE = '<html><title>{{ Title }}</title><link href="/index.css"><body>{{ Content }}</body></html>'
+
+
+class TestGeneratePages(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.content = os.path.join(self.root, "content")
+        self.template = os.path.join(self.root, "template.html")
+        with open(self.template, "w") as f:
+            f.write(TEMPLATE)
+        self.write_page("index.md", "# Home\n\nWelcome **home**")
+        self.write_page("blog/post/index.md", "# Post\n\n- one\n- two")
+        self.write_page("blog/notes.txt", "not markdown")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_page(self, rel_path, text):
+        path = os.path.join(self.content, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+
+    def read_tree(self, dest):
+        files = {}
+        for dirpath, _, filenames in os.walk(dest):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                with open(path, "rb") as f:
+                    files[os.path.relpath(path, dest)] = f.read()
+        return files
+
+    def test_find_pages(self):
+        dest = os.path.join(self.root, "docs")
+        pages = find_pages(self.content, dest)
+        self.assertEqual(
+            sorted(str(dest_path) for _, dest_path in pages),
+            [
+                os.path.join(dest, "blog", "post", "index.html"),
+                os.path.join(dest, "index.html"),
+            ],
+        )
+
+    def test_serial_build(self):
+        dest = os.path.join(self.root, "docs")
+        generate_pages_recursive(self.content, self.template, dest, "/site/")
+        files = self.read_tree(dest)
+        self.assertEqual(
+            files["index.html"],
+            b'<html><title>Home</title><link href="/site/index.css"><body>'
+            b'<div><h1>Home</h1><p>Welcome <b>home</b></p></div></body></html>',
+        )
+
+    def test_failed_page_keeps_previous_output(self):
+        dest = os.path.join(self.root, "docs")
+        generate_pages_recursive(self.content, self.template, dest, "/")
+        before = self.read_tree(dest)
+        self.write_page("index.md", "# Home\n\nan **unclosed span")
+        with self.assertRaises(PageGenerationError):
+            generate_pages_recursive(self.content, self.template, dest, "/")
+        self.assertEqual(self.read_tree(dest), before)
+
+    def test_parallel_build_matches_serial(self):
+        serial = os.path.join(self.root, "serial")
+        parallel = os.path.join(self.root, "parallel")
+        generate_pages_recursive(self.content, self.template, serial, "/")
+        generate_pages_recursive(self.content, self.template, parallel, "/", jobs=2)
+        self.assertEqual(self.read_tree(serial), self.read_tree(parallel))
+
+    def test_parallel_build_reports_failing_page(self):
+        self.write_page("broken.md", "no heading here")
+        dest = os.path.join(self.root, "docs")
+        with self.assertRaises(PageGenerationError) as ctx:
+            generate_pages_recursive(self.content, self.template, dest, "/", jobs=2)
+        self.assertTrue(ctx.exception.from_path.endswith("broken.md"))
+        self.assertIn("No h1 header found", str(ctx.exception))
+
+    def test_incremental_build_skips_fresh_pages(self):
+        dest = os.path.join(self.root, "docs")
+        manifest = BuildManifest(os.path.join(self.root, "manifest.json"))
+        generate_pages_recursive(self.content, self.template, dest, "/", manifest=manifest)
+        index_path = os.path.join(dest, "index.html")
+        post_path = os.path.join(dest, "blog", "post", "index.html")
+        os.utime(post_path, ns=(0, 0))
+        self.write_page("index.md", "# Home\n\nUpdated")
+
+        generate_pages_recursive(self.content, self.template, dest, "/", manifest=manifest)
+        self.assertEqual(os.stat(post_path).st_mtime_ns, 0)
+        with open(index_path) as f:
+            self.assertIn("<p>Updated</p>", f.read())
+
+    def test_incremental_build_removes_deleted_pages(self):
+        dest = os.path.join(self.root, "docs")
+        manifest = BuildManifest(os.path.join(self.root, "manifest.json"))
+        generate_pages_recursive(self.content, self.template, dest, "/", manifest=manifest)
+        os.remove(os.path.join(self.content, "index.md"))
+        generate_pages_recursive(self.content, self.template, dest, "/", manifest=manifest)
+        self.assertFalse(os.path.exists(os.path.join(dest, "index.html")))
+
+    def test_incremental_build_removes_deleted_pages_after_template_change(self):
+        dest = os.path.join(self.root, "docs")
+        manifest = BuildManifest(os.path.join(self.root, "manifest.json"))
+        generate_pages_recursive(self.content, self.template, dest, "/", manifest=manifest)
+        os.remove(os.path.join(self.content, "index.md"))
+        with open(self.template, "a") as f:
+            f.write("<footer></footer>")
+        generate_pages_recursive(self.content, self.template, dest, "/", manifest=manifest)
+        self.assertFalse(os.path.exists(os.path.join(dest, "index.html")))
+        self.assertNotIn(os.path.join(self.content, "index.md"), manifest.pages)
+
+    def test_cached_build_matches_uncached(self):
+        cache = ParseCache(os.path.join(self.root, "cache"))
+        plain = os.path.join(self.root, "plain")
+        cached = os.path.join(self.root, "cached")
+        generate_pages_recursive(self.content, self.template, plain, "/site/")
+        generate_pages_recursive(self.content, self.template, cached, "/site/", cache=cache)
+        self.assertEqual(self.read_tree(plain), self.read_tree(cached))
+        generate_pages_recursive(self.content, self.template, cached, "/site/", jobs=2, cache=cache)
+        self.assertEqual(self.read_tree(plain), self.read_tree(cached))
+
+    def test_template_change_reuses_cached_parse(self):
+        cache = ParseCache(os.path.join(self.root, "cache"))
+        dest = os.path.join(self.root, "docs")
+        generate_pages_recursive(self.content, self.template, dest, "/", cache=cache)
+        with open(self.template, "w") as f:
+            f.write("<main>{{ Content }}</main>")
+
+        original = parse_cache.parse_markdown
+        parse_cache.parse_markdown = None
+        try:
+            generate_pages_recursive(self.content, self.template, dest, "/", cache=cache)
+        finally:
+            parse_cache.parse_markdown = original
+        with open(os.path.join(dest, "index.html")) as f:
+            self.assertEqual(f.read(), "<main><div><h1>Home</h1><p>Welcome <b>home</b></p></div></main>")
+
+    def test_build_reports_block_reuse(self):
+        cache = ParseCache(os.path.join(self.root, "cache"))
+        dest = os.path.join(self.root, "docs")
+        generate_pages_recursive(self.content, self.template, dest, "/", cache=cache)
+        self.write_page("index.md", "# Home\n\nWelcome **back**")
+        results = generate_pages_recursive(self.content, self.template, dest, "/", cache=cache)
+        by_hit = sorted((stats["parse_cache"], stats["block_hits"], stats["block_misses"]) for stats in results)
+        self.assertEqual(by_hit, [("hit", 0, 0), ("miss", 1, 1)])
+        with open(os.path.join(dest, "index.html")) as f:
+            self.assertIn("<p>Welcome <b>back</b></p>", f.read())
+
+    def test_cache_summary(self):
+        results = [
+            {"parse_cache": "hit", "block_hits": 0, "block_misses": 0},
+            {"parse_cache": "miss", "block_hits": 3, "block_misses": 1},
+        ]
+        self.assertEqual(
+            cache_summary(results),
+            "parse cache: 1 of 2 pages reused; blocks: 3 reused, 1 rendered (75% hit rate)",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,14 @@
+import io
 import unittest
-from htmlnode import HTMLNode, LeafNode, ParentNode
+from htmlnode import HTMLNode, LeafNode, ParentNode, RawHTMLNode, escape_attr, escape_text
 
 class TestHTMLNode(unittest.TestCase):
+    def test_nodes_are_slotted(self):
+        for node in (HTMLNode("p"), LeafNode("b", "bold"), ParentNode("div", [])):
+            self.assertFalse(hasattr(node, "__dict__"))
+            with self.assertRaises(AttributeError):
+                node.extra = True
+
     def test_props_to_html_eq(self):
         node = HTMLNode("a", props={"href": "https://www.google.com","target": "_blank",})
         res = ' href="https://www.google.com" target="_blank"'
@@ -115,6 +122,61 @@ class TestHTMLNode(unittest.TestCase):
         parent_node = ParentNode("div", [child_node])
         self.assertNotEqual(parent_node.to_html(), "<div><p>different text</p></div>")
 
+    def test_parent_to_html_deep_nesting(self):
+        node = LeafNode("b", "deep")
+        for _ in range(10000):
+            node = ParentNode("span", [node])
+        html = node.to_html()
+        self.assertTrue(html.startswith("<span>" * 10000 + "<b>deep</b>"))
+        self.assertTrue(html.endswith("</span>" * 10000))
+
+    def test_parent_to_html_nested_child_without_tag_raises_error(self):
+        inner = ParentNode(None, [LeafNode("b", "bold")])
+        parent_node = ParentNode("div", [LeafNode(None, "text"), inner])
+        with self.assertRaises(ValueError):
+            parent_node.to_html()
+
+    def test_write_html_matches_to_html(self):
+        inner = ParentNode("p", [LeafNode(None, "Hello "), LeafNode("a", "link", {"href": "/x"})])
+        parent_node = ParentNode("div", [inner, LeafNode("code", "x = 1")], {"class": "post"})
+        fp = io.StringIO()
+        parent_node.write_html(fp)
+        self.assertEqual(fp.getvalue(), parent_node.to_html())
+
+    def test_leaf_write_html(self):
+        fp = io.StringIO()
+        LeafNode("b", "bold").write_html(fp)
+        self.assertEqual(fp.getvalue(), "<b>bold</b>")
+
+    def test_leaf_escapes_value(self):
+        node = LeafNode("code", 'if a < b && b > c: print("x")')
+        self.assertEqual(node.to_html(), '<code>if a &lt; b &amp;&amp; b &gt; c: print("x")</code>')
+
+    def test_leaf_without_tag_escapes_value(self):
+        self.assertEqual(LeafNode(None, "< Back Home").to_html(), "&lt; Back Home")
+
+    def test_props_to_html_escapes_values(self):
+        node = HTMLNode("a", props={"href": '/search?q=a&b="c"', "title": "<x>"})
+        self.assertEqual(
+            node.props_to_html(),
+            ' href="/search?q=a&amp;b=&quot;c&quot;" title="&lt;x&gt;"',
+        )
+
+    def test_props_to_html_empty_dict(self):
+        self.assertEqual(HTMLNode("p", props={}).props_to_html(), "")
+
+    def test_escape_fast_path_returns_same_string(self):
+        text = "nothing to escape here"
+        self.assertIs(escape_text(text), text)
+        self.assertIs(escape_attr(text), text)
+
+    def test_escape_text_keeps_quotes(self):
+        self.assertEqual(escape_text('"Váya márië."'), '"Váya márië."')
+
+    def test_raw_html_node_is_not_escaped(self):
+        parent_node = ParentNode("p", [RawHTMLNode("<b>bold</b> &amp; more")])
+        self.assertEqual(parent_node.to_html(), "<p><b>bold</b> &amp; more</p>")
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
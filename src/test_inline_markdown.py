@@ -1,3 +1,4 @@
+import random
 import unittest
 
 from textnode import TextNode, TextType
@@ -7,7 +8,10 @@ from inline_markdown import (
         extract_markdown_links, 
         split_nodes_image, 
         split_nodes_link, 
-        text_to_textnodes
+        text_to_textnodes,
+        TextNodeMemo,
+        get_textnode_memo,
+        set_textnode_memo,
 )
 
 class TestSplitNodesDelimiter(unittest.TestCase):
@@ -729,6 +733,22 @@ class TestSplitNodesLink(unittest.TestCase):
         ]
         self.assertEqual(new_nodes, expected)
 
+    def test_link_snippet_also_inside_image(self):
+        node = TextNode("See ![a](b.png) then [a](b.png)", TextType.TEXT)
+        new_nodes = split_nodes_link([node])
+        expected = [
+            TextNode("See ![a](b.png) then ", TextType.TEXT),
+            TextNode("a", TextType.LINK, "b.png")
+        ]
+        self.assertEqual(new_nodes, expected)
+
+    def test_many_links(self):
+        text = "".join(f"[l{i}](u{i}) " for i in range(1000))
+        new_nodes = split_nodes_link([TextNode(text, TextType.TEXT)])
+        self.assertEqual(len(new_nodes), 2000)
+        self.assertEqual(new_nodes[-2], TextNode("l999", TextType.LINK, "u999"))
+        self.assertEqual(new_nodes[-1], TextNode(" ", TextType.TEXT))
+
 
 class TestTextToTextNodes(unittest.TestCase):
 
@@ -989,5 +1009,131 @@ class TestTextToTextNodes(unittest.TestCase):
         self.assertEqual(result, expected)
 
 
+def reference_text_to_textnodes(text):
+    nodes = split_nodes_image([TextNode(text, TextType.TEXT)])
+    nodes = split_nodes_link(nodes)
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    return split_nodes_delimiter(nodes, "`", TextType.CODE)
+
+
+DIFFERENTIAL_CASES = [
+    "This is just plain text with no formatting",
+    "This has **bold** text",
+    "This has _italic_ text",
+    "This has `code` text",
+    "This has an ![image](https://example.com/image.png)",
+    "This has a [link](https://example.com)",
+    "Text with **bold** and **more bold** formatting",
+    "Text with **bold**, _italic_, and `code`",
+    "Check out ![image](img.png) and [link](url.com)",
+    "Text with ![image](img.png) and [link](url.com) and **bold** and _italic_ and `code`",
+    "Text with **bold _italic_ bold** formatting",
+    "**bold**_italic_`code`",
+    "**bold** text at start",
+    "text ends with **bold**",
+    "**entirely bold**",
+    "",
+    "This is **text** with an _italic_ word and a `code block` and an ![obi wan image](https://i.imgur.com/fJRm4Vk.jpeg) and a [link](https://boot.dev)",
+    "![**bold** alt text](image.png)",
+    "[**bold** link text](url.com)",
+    "![img1](url1.png) text ![img2](url2.jpg) more [link1](site1.com) text [link2](site2.com)",
+    "Text with ** ** and _ _ and ` ` formatting",
+    "Text with ![image with **bold**](img.png) in alt",
+    "Link with [**bold** text](url.com) should not process bold",
+    "Text with ![](empty.png) and []() and **** and __ and ``",
+    "Text with **bold _italic_ bold** and _italic `code` italic_",
+    "a****b and __ and `` between",
+    "***triple*** stars and *single* stars",
+    "!![nested](img.png) and ![a[b](c) and [x![y](z)",
+    "[one](a.com)[two](b.com)![three](c.png)",
+]
+
+UNCLOSED_CASES = [
+    "Unclosed **bold",
+    "`code **bold** code`",
+    "_italic **bold** italic_",
+    "**[link](url.com)**",
+]
+
+FUZZ_TOKENS = ["**", "_", "`", "*", "!", "[", "]", "(", ")", "![a](u.png)", "[l](v.com)", "x", " "]
+
+
+class TestTextToTextNodesDifferential(unittest.TestCase):
+
+    def assertMatchesReference(self, text):
+        try:
+            expected = reference_text_to_textnodes(text)
+        except ValueError:
+            with self.assertRaises(ValueError, msg=repr(text)):
+                text_to_textnodes(text)
+            return
+        self.assertEqual(text_to_textnodes(text), expected, msg=repr(text))
+
+    def test_known_cases(self):
+        for text in DIFFERENTIAL_CASES:
+            self.assertMatchesReference(text)
+
+    def test_unclosed_cases(self):
+        for text in UNCLOSED_CASES:
+            with self.assertRaises(ValueError):
+                reference_text_to_textnodes(text)
+            self.assertMatchesReference(text)
+
+    def test_random_cases(self):
+        rng = random.Random(1234)
+        for _ in range(5000):
+            text = "".join(rng.choice(FUZZ_TOKENS) for _ in range(rng.randint(0, 12)))
+            self.assertMatchesReference(text)
+
+
+class TestTextNodeMemo(unittest.TestCase):
+
+    def setUp(self):
+        self.memo = TextNodeMemo(max_entries=2)
+        self.previous = set_textnode_memo(self.memo)
+
+    def tearDown(self):
+        set_textnode_memo(self.previous)
+
+    def test_memoized_nodes_match_unmemoized(self):
+        text = "A **bold** and _italic_ [link](https://boot.dev) with `code`"
+        nodes = text_to_textnodes(text)
+        self.assertIsInstance(nodes, tuple)
+        set_textnode_memo(None)
+        self.assertEqual(list(nodes), text_to_textnodes(text))
+
+    def test_repeated_text_is_shared(self):
+        first = text_to_textnodes("- item with **bold**")
+        second = text_to_textnodes("- item with **bold**")
+        self.assertIs(first, second)
+        self.assertEqual((self.memo.hits, self.memo.misses), (1, 1))
+        self.assertEqual(self.memo.hit_rate(), 0.5)
+
+    def test_evicts_least_recently_used(self):
+        text_to_textnodes("one")
+        text_to_textnodes("two")
+        text_to_textnodes("one")
+        text_to_textnodes("three")
+        self.assertEqual(list(self.memo.entries), ["one", "three"])
+
+    def test_invalid_markdown_is_not_memoized(self):
+        with self.assertRaises(ValueError):
+            text_to_textnodes("an **unclosed span")
+        self.assertEqual(len(self.memo), 0)
+
+    def test_clear_and_footprint(self):
+        text_to_textnodes("some _text_")
+        self.assertGreater(self.memo.memory_footprint(), 0)
+        self.assertIn("1 entries", repr(self.memo))
+        self.memo.clear()
+        self.assertEqual((len(self.memo), self.memo.hits, self.memo.misses), (0, 0, 0))
+
+    def test_set_returns_previous_memo(self):
+        other = TextNodeMemo()
+        self.assertIs(set_textnode_memo(other), self.memo)
+        self.assertIs(get_textnode_memo(), other)
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
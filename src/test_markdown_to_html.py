@@ -1,5 +1,7 @@
+import io
 import unittest
-from markdown_to_html import markdown_to_html_node, extract_title
+from markdown_to_html import markdown_to_html_node, extract_title, parse_markdown, block_converters, StreamedDocument
+from block_markdown import BlockType
 from htmlnode import ParentNode, LeafNode
 
 
@@ -284,6 +286,29 @@ second code block
         self.assertTrue(len(result.children) >= 1)
 
 
+    def test_code_block_with_blank_lines(self):
+        markdown = "```\nfirst\n\nsecond\n```"
+        result = markdown_to_html_node(markdown)
+        self.assertEqual(result.to_html(), "<div><pre><code>first\n\nsecond\n</code></pre></div>")
+
+    def test_every_block_type_has_converter(self):
+        self.assertEqual(set(block_converters), set(BlockType))
+
+    def test_quote_with_empty_line(self):
+        markdown = "> first\n>\n> third"
+        result = markdown_to_html_node(markdown)
+        self.assertEqual(result.to_html(), "<div><blockquote>first\n\nthird</blockquote></div>")
+
+    def test_ordered_list_past_nine(self):
+        markdown = "\n".join(f"{i}. item {i}" for i in range(1, 12))
+        result = markdown_to_html_node(markdown)
+        self.assertEqual(result.children[0].children[10].to_html(), "<li>item 11</li>")
+
+    def test_from_file_object(self):
+        markdown = "# Title\n\nSome **bold** text\n\n- item\n"
+        result = markdown_to_html_node(io.StringIO(markdown))
+        self.assertEqual(result.to_html(), markdown_to_html_node(markdown).to_html())
+
 class TestExtractTitle(unittest.TestCase):
 
     def test_extract_title_simple(self):
@@ -389,6 +414,83 @@ More content."""
         result = extract_title(markdown)
         self.assertEqual(result, "Title")
 
+    def test_extract_title_stops_at_first_h1(self):
+        def lines():
+            yield "Intro paragraph"
+            yield ""
+            yield "# The Title"
+            yield ""
+            raise AssertionError("read past the title")
+        self.assertEqual(extract_title(lines()), "The Title")
+
+
+class TestParseMarkdown(unittest.TestCase):
+
+    def test_parse_collects_metadata(self):
+        markdown = """# Main Title
+
+Some **bold** text here.
+
+## Section
+
+- one
+- two"""
+        parsed = parse_markdown(markdown)
+        self.assertEqual(parsed.title, "Main Title")
+        self.assertEqual(parsed.headings, [(1, "Main Title"), (2, "Section")])
+        self.assertEqual(parsed.word_count, 9)
+        self.assertEqual(parsed.node.to_html(), markdown_to_html_node(markdown).to_html())
+
+    def test_streamed_document_matches_parsed_node(self):
+        markdown = "# Title\n\nSome **bold** & <text>\n\n- one\n- two\n\n```\ncode\n```"
+        fp = io.StringIO()
+        StreamedDocument(io.StringIO(markdown)).write_html(fp)
+        self.assertEqual(fp.getvalue(), parse_markdown(markdown).node.to_html())
+
+    def test_word_count_skips_block_markers(self):
+        markdown = """# Title
+
+> quoted words here
+
+1. first item
+2. second item
+
+```
+code line
+```"""
+        self.assertEqual(parse_markdown(markdown).word_count, 10)
+
+    def test_parse_title_matches_extract_title(self):
+        markdown = "## Subtitle\n\n# First Title\nwith more\n\n# Second Title"
+        self.assertEqual(parse_markdown(markdown).title, extract_title(markdown))
+
+    def test_parse_without_h1(self):
+        parsed = parse_markdown("## Only a subtitle\n\ntext")
+        self.assertIsNone(parsed.title)
+        self.assertEqual(parsed.headings, [(2, "Only a subtitle")])
+
+    def test_parse_from_file_object(self):
+        markdown = "# Title\n\nbody text"
+        self.assertEqual(parse_markdown(io.StringIO(markdown)), parse_markdown(markdown))
+
+    def test_parse_renders_inline_spans_directly(self):
+        markdown = """# Title with `code`
+
+A paragraph with **bold**, _italic_, a [link](https://boot.dev) and ![img](/a.png).
+
+> quoted **text**
+
+- item _one_
+- item [two](/two)
+
+1. first `step`
+2. second"""
+        parsed = parse_markdown(markdown)
+        paragraph = parsed.node.children[1]
+        self.assertEqual(len(paragraph.children), 1)
+        self.assertIsNone(paragraph.children[0].tag)
+        self.assertEqual(parsed.node.to_html(), markdown_to_html_node(markdown).to_html())
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
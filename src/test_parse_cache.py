@@ -0,0 +1,119 @@
+import os
+import tempfile
+import time
+import unittest
+
+import parse_cache
+from htmlnode import RawHTMLNode
+from markdown_to_html import parse_markdown
+from parse_cache import ParseCache
+
+MARKDOWN = """# Title
+
+Some **bold** text & a [link](/about).
+
+## Section
+
+- one
+- two
+"""
+
+
+class TestParseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ParseCache(os.path.join(self.tmp.name, "parsed"))
+        self.parse_calls = 0
+        original = parse_cache.parse_markdown
+
+        def counting_parse_markdown(markdown, **kwargs):
+            self.parse_calls += 1
+            return original(markdown, **kwargs)
+
+        parse_cache.parse_markdown = counting_parse_markdown
+        self.addCleanup(setattr, parse_cache, "parse_markdown", original)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_miss_then_hit(self):
+        source = MARKDOWN.encode()
+        stats = {}
+        parsed = self.cache.parse(source, stats=stats)
+        self.assertEqual(stats, {"parse_cache": "miss"})
+        cached = self.cache.parse(source, stats=stats)
+        self.assertEqual(stats, {"parse_cache": "hit"})
+        self.assertEqual(self.parse_calls, 1)
+        self.assertEqual(cached, parsed)
+        self.assertEqual(cached, parse_markdown(MARKDOWN))
+
+    def test_miss_returns_the_stored_rendering(self):
+        parsed = self.cache.parse(MARKDOWN.encode())
+        self.assertIsInstance(parsed.node, RawHTMLNode)
+        self.assertEqual(parsed.node.to_html(), parse_markdown(MARKDOWN).node.to_html())
+
+    def test_edit_is_a_miss(self):
+        self.cache.parse(MARKDOWN.encode())
+        self.assertIsNotNone(self.cache.get(MARKDOWN.encode()))
+        self.assertIsNone(self.cache.get((MARKDOWN + "\nmore").encode()))
+        self.cache.parse((MARKDOWN + "\nmore").encode())
+        self.assertEqual(self.parse_calls, 2)
+
+    def test_parser_version_is_part_of_key(self):
+        key = self.cache.key(b"# Title")
+        version = parse_cache.PARSER_VERSION
+        parse_cache.PARSER_VERSION = version + 1
+        try:
+            self.assertNotEqual(self.cache.key(b"# Title"), key)
+        finally:
+            parse_cache.PARSER_VERSION = version
+
+    def test_corrupt_entry_is_a_miss(self):
+        source = MARKDOWN.encode()
+        self.cache.parse(source)
+        with open(self.cache.entry_path(self.cache.key(source)), "wb") as f:
+            f.write(b"not marshal")
+        stats = {}
+        self.cache.parse(source, stats=stats)
+        self.assertEqual(stats["parse_cache"], "miss")
+
+    def test_evict_removes_least_recently_used(self):
+        sources = [f"# Page {i}\n\n{'text ' * 200}".encode() for i in range(3)]
+        for i, source in enumerate(sources):
+            self.cache.parse(source)
+            path = self.cache.entry_path(self.cache.key(source))
+            os.utime(path, ns=(time.time_ns(), time.time_ns() - (10 - i) * 10**9))
+        self.cache.get(sources[0])
+
+        entry_size = os.path.getsize(self.cache.entry_path(self.cache.key(sources[0])))
+        self.cache.max_bytes = entry_size * 2 + 10
+        removed = self.cache.evict()
+
+        self.assertEqual(removed, [self.cache.entry_path(self.cache.key(sources[1]))])
+        self.assertIsNotNone(self.cache.get(sources[0]))
+        self.assertIsNotNone(self.cache.get(sources[2]))
+
+    def test_edited_page_reuses_unchanged_blocks(self):
+        from_path = "content/page.md"
+        stats = {}
+        self.cache.parse(MARKDOWN.encode(), from_path, stats)
+        self.assertEqual(stats, {"parse_cache": "miss", "block_hits": 0, "block_misses": 4})
+
+        edited = MARKDOWN.replace("Some **bold** text", "Some **edited** text")
+        parsed = self.cache.parse(edited.encode(), from_path, stats)
+        self.assertEqual(stats, {"parse_cache": "miss", "block_hits": 3, "block_misses": 1})
+        self.assertEqual(parsed, parse_markdown(edited))
+
+    def test_block_memo_is_per_page(self):
+        self.cache.parse(MARKDOWN.encode(), "content/a.md")
+        stats = {}
+        self.cache.parse((MARKDOWN + "\nextra").encode(), "content/b.md", stats)
+        self.assertEqual(stats["block_hits"], 0)
+
+    def test_evict_missing_dir(self):
+        self.assertEqual(self.cache.evict(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import tempfile
+import time
+import unittest
+
+import profiler
+from generate_page import generate_pages_recursive
+from profiler import Profiler, set_profiler
+
+
+class TestProfiler(unittest.TestCase):
+
+    def test_nested_stages_record_exclusive_time(self):
+        prof = Profiler()
+        with prof.stage("outer"):
+            time.sleep(0.02)
+            with prof.stage("inner"):
+                time.sleep(0.02)
+        outer, outer_calls = prof.stages["outer"]
+        inner, inner_calls = prof.stages["inner"]
+        self.assertEqual((outer_calls, inner_calls), (1, 1))
+        self.assertGreaterEqual(inner, 0.02)
+        self.assertLess(outer, 0.035)
+
+    def test_merge_adds_totals_and_calls(self):
+        prof = Profiler()
+        prof.merge({"render": [0.5, 2]})
+        prof.merge({"render": [0.25, 1], "write": [0.1, 1]})
+        self.assertEqual(prof.stages, {"render": [0.75, 3], "write": [0.1, 1]})
+
+    def test_report_ranks_stages_and_pages(self):
+        prof = Profiler()
+        prof.merge({"write": [0.001, 1], "inline parse": [0.003, 40]})
+        prof.add_page("a.md", 0.001)
+        prof.add_page("b.md", 0.002)
+        lines = prof.report().splitlines()
+        self.assertTrue(lines[1].startswith("inline parse"))
+        self.assertTrue(lines[2].startswith("write"))
+        self.assertTrue(lines[3].startswith("total"))
+        self.assertIn("b.md", lines[5])
+        self.assertIn("a.md", lines[6])
+
+    def test_stage_is_a_no_op_without_active_profiler(self):
+        previous = set_profiler(None)
+        self.addCleanup(set_profiler, previous)
+        with profiler.stage("discovery"):
+            pass
+        self.assertIsNone(profiler.active)
+
+
+class TestProfiledBuild(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.template = os.path.join(self.tmp.name, "template.html")
+        with open(self.template, "w") as f:
+            f.write("<title>{{ Title }}</title>{{ Content }}")
+        for rel_path, text in (("index.md", "# Home\n\nHello **world**"), ("blog/post.md", "# Post\n\n- a\n- b")):
+            path = os.path.join(self.content, rel_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write(text)
+        self.profiler = Profiler()
+        self.previous = set_profiler(self.profiler)
+
+    def tearDown(self):
+        set_profiler(self.previous)
+        self.tmp.cleanup()
+
+    def build(self, dest, jobs):
+        generate_pages_recursive(self.content, self.template, os.path.join(self.tmp.name, dest), "/", jobs=jobs)
+        with open(os.path.join(self.tmp.name, dest, "index.html")) as f:
+            return f.read()
+
+    def test_serial_build_records_stages_and_pages(self):
+        html = self.build("docs", jobs=1)
+        self.assertEqual(html, "<title>Home</title><div><h1>Home</h1><p>Hello <b>world</b></p></div>")
+        for stage in ("discovery", "reading", "block parse", "inline parse", "render", "template", "write"):
+            self.assertIn(stage, self.profiler.stages)
+        self.assertEqual(self.profiler.stages["reading"][1], 2)
+        self.assertEqual(len(self.profiler.pages), 2)
+        self.assertIs(profiler.active, self.profiler)
+
+    def test_parallel_build_collects_worker_stages(self):
+        self.build("docs", jobs=2)
+        self.assertEqual(self.profiler.stages["write"][1], 2)
+        self.assertEqual(len(self.profiler.pages), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import io
+import unittest
+
+from htmlnode import LeafNode, ParentNode
+
+from template import Template, rewrite_urls
+
+
+class TestTemplate(unittest.TestCase):
+
+    def test_render_fills_placeholders(self):
+        template = Template("<title>{{ Title }}</title><body>{{ Content }}</body>")
+        self.assertEqual(
+            template.render("Home", "<p>hi</p>"),
+            "<title>Home</title><body><p>hi</p></body>",
+        )
+
+    def test_render_repeated_placeholders(self):
+        template = Template("{{ Title }}|{{ Content }}|{{ Title }}")
+        self.assertEqual(template.render("T", "C"), "T|C|T")
+
+    def test_render_without_placeholders(self):
+        template = Template("<p>static</p>")
+        self.assertEqual(template.render("T", "C"), "<p>static</p>")
+
+    def test_base_path_applied_to_static_parts(self):
+        template = Template('<link href="/index.css"><img src="/logo.png">{{ Content }}', "/site/")
+        self.assertEqual(
+            template.static_parts,
+            ['<link href="/site/index.css"><img src="/site/logo.png">', ""],
+        )
+
+    def test_base_path_applied_to_content(self):
+        template = Template('<a href="/">{{ Title }}</a>{{ Content }}', "/site/")
+        self.assertEqual(
+            template.render("Home", '<a href="/blog">blog</a><img src="/a.png">'),
+            '<a href="/site/">Home</a><a href="/site/blog">blog</a><img src="/site/a.png">',
+        )
+
+    def test_matches_replace_pipeline(self):
+        text = '<html><title>{{ Title }}</title><link href="/index.css" /><article>{{ Content }}</article></html>'
+        title = "Tolkien Fan Club"
+        content = '<div><p><a href="/contact">contact</a></p><img src="/images/tom.png" alt="tom"></div>'
+        base_path = "/StaticSiteGenerator/"
+        expected = text.replace("{{ Title }}", title).replace("{{ Content }}", content)
+        expected = expected.replace('href="/', f'href="{base_path}').replace('src="/', f'src="{base_path}')
+        self.assertEqual(Template(text, base_path).render(title, content), expected)
+
+    def test_write_streams_content_node(self):
+        template = Template('<title>{{ Title }}</title><link href="/a.css">{{ Content }}', "/site/")
+        node = ParentNode("div", [LeafNode("a", "blog", {"href": "/blog"}), LeafNode("img", "", {"src": "/a.png"})])
+        fp = io.StringIO()
+        template.write(fp, "Home", node)
+        self.assertEqual(fp.getvalue(), template.render("Home", node.to_html()))
+
+    def test_title_is_escaped(self):
+        template = Template("<title>{{ Title }}</title>{{ Content }}")
+        node = LeafNode("h1", "Tom & <Jerry>")
+        fp = io.StringIO()
+        template.write(fp, "Tom & <Jerry>", node)
+        expected = "<title>Tom &amp; &lt;Jerry&gt;</title><h1>Tom &amp; &lt;Jerry&gt;</h1>"
+        self.assertEqual(fp.getvalue(), expected)
+        self.assertEqual(template.render("Tom & <Jerry>", node.to_html()), expected)
+
+    def test_rewrite_urls_with_assets(self):
+        assets = {"/index.css": "/index.1a2b3c4d.css"}
+        self.assertEqual(
+            rewrite_urls('<link href="/index.css"><a href="/index.css.map">map</a>', "/site/", assets),
+            '<link href="/site/index.1a2b3c4d.css"><a href="/site/index.css.map">map</a>',
+        )
+
+    def test_write_uses_fingerprinted_assets(self):
+        assets = {"/index.css": "/index.1a2b3c4d.css", "/images/tom.png": "/images/tom.5e6f7a8b.png"}
+        template = Template('<link href="/index.css">{{ Content }}', "/", assets)
+        node = ParentNode("div", [LeafNode("img", "", {"src": "/images/tom.png"})])
+        fp = io.StringIO()
+        template.write(fp, "Home", node)
+        self.assertEqual(
+            fp.getvalue(),
+            '<link href="/index.1a2b3c4d.css"><div><img src="/images/tom.5e6f7a8b.png"></img></div>',
+        )
+
+    def test_from_file_missing(self):
+        with self.assertRaises(FileNotFoundError):
+            Template.from_file("./does-not-exist.html")
+
+    def test_from_file_wrong_extension(self):
+        with self.assertRaises(ValueError):
+            Template.from_file(__file__)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
+import copy
+import pickle
 import unittest
 
-from textnode import TextNode, TextType, text_node_to_html_node
+from textnode import TextNode, TextType, text_node_to_html_node, text_nodes_to_html
 
 
 class TestTextNode(unittest.TestCase):
@@ -29,6 +31,21 @@ class TestTextNode(unittest.TestCase):
         node2 = TextNode("This is a image", TextType.IMAGE, "public/image2.png")
         self.assertNotEqual(node, node2)
 
+    def test_immutable(self):
+        node = TextNode("This is a link", TextType.LINK, "/about")
+        with self.assertRaises(AttributeError):
+            node.text = "changed"
+        with self.assertRaises(AttributeError):
+            node.url = "/elsewhere"
+        with self.assertRaises(AttributeError):
+            del node.text_type
+        self.assertEqual(node, TextNode("This is a link", TextType.LINK, "/about"))
+
+    def test_copy_and_pickle(self):
+        node = TextNode("This is a image", TextType.IMAGE, "public/image1.png")
+        self.assertEqual(copy.copy(node), node)
+        self.assertEqual(pickle.loads(pickle.dumps(node)), node)
+
 class TestTextNodeToHTML(unittest.TestCase):
     def test_text(self):
         node = TextNode("This is a text node", TextType.TEXT)
@@ -74,5 +91,43 @@ class TestTextNodeToHTML(unittest.TestCase):
             text_node_to_html_node(node)
 
 
+class TestTextNodesToHTML(unittest.TestCase):
+    def test_matches_leaf_nodes(self):
+        nodes = [
+            TextNode("plain ", TextType.TEXT),
+            TextNode("bold", TextType.BOLD),
+            TextNode("italic", TextType.ITALIC),
+            TextNode("code", TextType.CODE),
+            TextNode("link", TextType.LINK, "https://boot.dev"),
+            TextNode("alt text", TextType.IMAGE, "/images/tom.png"),
+        ]
+        self.assertEqual(
+            text_nodes_to_html(nodes),
+            "".join(text_node_to_html_node(node).to_html() for node in nodes),
+        )
+
+    def test_empty(self):
+        self.assertEqual(text_nodes_to_html([]), "")
+
+    def test_escapes_text_and_urls(self):
+        nodes = [
+            TextNode("< Back Home", TextType.LINK, "/?a=1&b=2"),
+            TextNode(" a & b ", TextType.TEXT),
+            TextNode('say "hi"', TextType.IMAGE, "/x.png"),
+        ]
+        self.assertEqual(
+            text_nodes_to_html(nodes),
+            '<a href="/?a=1&amp;b=2">&lt; Back Home</a> a &amp; b <img src="/x.png" alt="say &quot;hi&quot;"></img>',
+        )
+        self.assertEqual(
+            text_nodes_to_html(nodes),
+            "".join(text_node_to_html_node(node).to_html() for node in nodes),
+        )
+
+    def test_invalid_text_type(self):
+        with self.assertRaises(ValueError):
+            text_nodes_to_html([TextNode("x", "underline")])
+
+
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,46 @@
+import os
+import tempfile
+import unittest
+
+from walk import scan_files
+
+
+class TestScanFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        for rel_path in ("b.md", "a/index.md", "a/deep/x.png", "c.css"):
+            path = os.path.join(self.root, rel_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write(rel_path)
+        os.makedirs(os.path.join(self.root, "empty"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_scan_files_flat_sorted_list(self):
+        files = scan_files(self.root)
+        self.assertEqual(
+            [rel_path for _, rel_path in files],
+            [
+                os.path.join("a", "deep", "x.png"),
+                os.path.join("a", "index.md"),
+                "b.md",
+                "c.css",
+            ],
+        )
+
+    def test_scan_files_entries_point_at_files(self):
+        for entry, rel_path in scan_files(self.root):
+            self.assertEqual(entry.path, os.path.join(self.root, rel_path))
+            self.assertTrue(entry.is_file())
+
+    def test_scan_files_missing_root(self):
+        with self.assertRaises(FileNotFoundError):
+            scan_files(os.path.join(self.root, "missing"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+import gzip
+import os
+import tempfile
+import unittest
+
+import watch
+from compress import SidecarRecord
+from inline_markdown import TextNodeMemo, set_textnode_memo
+from watch import Watcher, diff_snapshots
+
+
+class TestDiffSnapshots(unittest.TestCase):
+
+    def test_diff_snapshots(self):
+        old = {"a.md": (1, 10), "b.md": (1, 10), "c.md": (1, 10)}
+        new = {"a.md": (1, 10), "b.md": (2, 11), "d.md": (1, 10)}
+        self.assertEqual(diff_snapshots(old, new), (["b.md", "d.md"], ["c.md"]))
+
+
+class TestWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = self.tmp.name
+        self.content = os.path.join(root, "content")
+        self.static = os.path.join(root, "static")
+        self.public = os.path.join(root, "docs")
+        self.template = os.path.join(root, "template.html")
+        self.write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+        self.write(os.path.join(self.content, "index.md"), "# Home")
+        self.write(os.path.join(self.content, "blog", "post.md"), "# Post")
+        self.write(os.path.join(self.static, "index.css"), "body {}")
+        os.makedirs(self.public)
+        self.watcher = Watcher(self.content, self.static, self.template, self.public, "/")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+
+    def read(self, rel_path):
+        with open(os.path.join(self.public, rel_path)) as f:
+            return f.read()
+
+    def test_poll_without_changes(self):
+        self.assertIsNone(self.watcher.poll())
+
+    def test_poll_renders_only_changed_page(self):
+        self.write(os.path.join(self.content, "index.md"), "# Home page")
+        self.watcher.poll()
+        self.assertEqual(self.read("index.html"), "<title>Home page</title><div><h1>Home page</h1></div>")
+        self.assertFalse(os.path.exists(os.path.join(self.public, "blog", "post.html")))
+
+    def test_poll_removes_deleted_page(self):
+        self.write(os.path.join(self.public, "index.html"), "old")
+        os.remove(os.path.join(self.content, "index.md"))
+        self.watcher.poll()
+        self.assertFalse(os.path.exists(os.path.join(self.public, "index.html")))
+
+    def test_template_change_rerenders_all_pages(self):
+        self.write(self.template, "<main>{{ Content }}</main>")
+        self.watcher.poll()
+        self.assertEqual(self.read("index.html"), "<main><div><h1>Home</h1></div></main>")
+        self.assertEqual(self.read(os.path.join("blog", "post.html")), "<main><div><h1>Post</h1></div></main>")
+
+    def test_poll_copies_changed_static_file(self):
+        self.write(os.path.join(self.static, "images", "logo.svg"), "<svg/>")
+        self.watcher.poll()
+        self.assertEqual(self.read(os.path.join("images", "logo.svg")), "<svg/>")
+
+    def test_poll_survives_broken_page(self):
+        self.write(os.path.join(self.content, "index.md"), "no title here")
+        self.watcher.poll()
+        self.write(os.path.join(self.content, "index.md"), "# Fixed the title")
+        self.watcher.poll()
+        self.assertIn("<h1>Fixed the title</h1>", self.read("index.html"))
+
+    def test_poll_refreshes_gzip_sidecars(self):
+        watcher = Watcher(
+            self.content, self.static, self.template, self.public, "/",
+            gzip_record=SidecarRecord(), gzip_min_size=0,
+        )
+        self.write(os.path.join(self.content, "index.md"), "# Home page")
+        self.write(os.path.join(self.static, "index.css"), "body { margin: 0; }")
+        watcher.poll()
+        with gzip.open(os.path.join(self.public, "index.html.gz"), "rt") as f:
+            self.assertEqual(f.read(), self.read("index.html"))
+        with gzip.open(os.path.join(self.public, "index.css.gz"), "rt") as f:
+            self.assertEqual(f.read(), "body { margin: 0; }")
+
+        os.remove(os.path.join(self.content, "index.md"))
+        watcher.poll()
+        self.assertFalse(os.path.exists(os.path.join(self.public, "index.html.gz")))
+
+    def test_poll_retries_after_template_vanishes(self):
+        os.remove(self.template)
+        with self.assertRaises(OSError):
+            self.watcher.poll()
+        self.write(self.template, "<main>{{ Content }}</main>")
+        self.watcher.poll()
+        self.assertEqual(self.read("index.html"), "<main><div><h1>Home</h1></div></main>")
+
+    def test_poll_skips_static_file_removed_before_copy(self):
+        temp_path = os.path.join(self.static, "4913")
+        self.write(temp_path, "")
+        self.write(os.path.join(self.static, "index.css"), "body { margin: 0; }")
+        original = watch.snapshot
+
+        def snapshot_then_remove(root, suffix=""):
+            files = original(root, suffix)
+            if root == self.static:
+                os.remove(temp_path)
+            return files
+
+        watch.snapshot = snapshot_then_remove
+        self.addCleanup(setattr, watch, "snapshot", original)
+        self.watcher.poll()
+        self.assertEqual(self.read("index.css"), "body { margin: 0; }")
+        self.assertFalse(os.path.exists(os.path.join(self.public, "4913")))
+
+    def test_run_survives_os_error(self):
+        calls = []
+
+        def poll():
+            calls.append(1)
+            if len(calls) == 1:
+                raise FileNotFoundError("template.html")
+            raise KeyboardInterrupt
+
+        self.watcher.poll = poll
+        self.watcher.run(interval=0)
+        self.assertEqual(len(calls), 2)
+
+    def test_poll_clears_inline_memo(self):
+        memo = TextNodeMemo()
+        previous = set_textnode_memo(memo)
+        self.addCleanup(set_textnode_memo, previous)
+        self.write(os.path.join(self.content, "index.md"), "# Home page")
+        self.watcher.poll()
+        self.assertEqual(len(memo), 0)
+        self.assertEqual(memo.hits + memo.misses, 0)
+        self.assertEqual(self.read("index.html"), "<title>Home page</title><div><h1>Home page</h1></div>")
+
+
+if __name__ == "__main__":
+    unittest.main()
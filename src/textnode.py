@@ -1,5 +1,6 @@
 from enum import Enum
-from htmlnode import LeafNode
+import profiler
+from htmlnode import LeafNode, escape_attr, escape_text
 
 class TextType(Enum):
     TEXT = "text"
@@ -10,23 +11,45 @@ class TextType(Enum):
     IMAGE = "image"
 
 class TextNode:
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text, text_type, url = None):
-        self.text = text
-        self.text_type = text_type
-        self.url = url
+        _set_text(self, text)
+        _set_text_type(self, text_type)
+        _set_url(self, url)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"TextNode is immutable, cannot set {name}")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"TextNode is immutable, cannot delete {name}")
+
+    def __reduce__(self):
+        return (TextNode, (self.text, self.text_type, self.url))
 
     def __eq__(self, textnode):
-        if (
+        if not isinstance(textnode, TextNode):
+            return NotImplemented
+        return (
             textnode.text == self.text and 
             textnode.text_type == self.text_type and
             textnode.url == self.url
-            ):
-            return True
-        return False
+        )
+
+    def __hash__(self):
+        return hash((self.text, self.text_type, self.url))
+
+    def __iter__(self):
+        return iter((self.text, self.text_type, self.url))
     
     def __repr__(self):
         return f"TextNode({self.text}, {self.text_type.value}, {self.url})"
 
+# Slot descriptors write the attributes directly, bypassing the __setattr__ guard.
+_set_text = TextNode.text.__set__
+_set_text_type = TextNode.text_type.__set__
+_set_url = TextNode.url.__set__
+
 def text_node_to_html_node(text_node):
     if text_node.text_type == TextType.TEXT:
         return LeafNode(None, text_node.text)
@@ -41,3 +64,35 @@ def text_node_to_html_node(text_node):
     if text_node.text_type == TextType.IMAGE:
         return LeafNode("img", "", {"src": text_node.url, "alt": text_node.text})
     raise ValueError(f"invalid text type: {text_node.text_type}")
+
+_inline_tags = {
+    TextType.BOLD: ("<b>", "</b>"),
+    TextType.ITALIC: ("<i>", "</i>"),
+    TextType.CODE: ("<code>", "</code>"),
+}
+
+def write_text_nodes(text_nodes, write):
+    for text_node in text_nodes:
+        text_type = text_node.text_type
+        if text_type is TextType.TEXT:
+            write(escape_text(text_node.text))
+        elif text_type in _inline_tags:
+            open_tag, close_tag = _inline_tags[text_type]
+            write(open_tag)
+            write(escape_text(text_node.text))
+            write(close_tag)
+        elif text_type is TextType.LINK:
+            write(f'<a href="{escape_attr(text_node.url)}">{escape_text(text_node.text)}</a>')
+        elif text_type is TextType.IMAGE:
+            write(f'<img src="{escape_attr(text_node.url)}" alt="{escape_attr(text_node.text)}"></img>')
+        else:
+            raise ValueError(f"invalid text type: {text_type}")
+
+def text_nodes_to_html(text_nodes):
+    parts = []
+    if profiler.active is not None:
+        with profiler.active.stage("render"):
+            write_text_nodes(text_nodes, parts.append)
+            return "".join(parts)
+    write_text_nodes(text_nodes, parts.append)
+    return "".join(parts)
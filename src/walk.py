@@ -0,0 +1,13 @@
+import os
+
+def scan_files(root, rel_dir=""):
+    files = []
+    with os.scandir(root) as it:
+        entries = sorted(it, key=lambda entry: entry.name)
+    for entry in entries:
+        rel_path = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+        if entry.is_dir():
+            files.extend(scan_files(entry.path, rel_path))
+        elif entry.is_file():
+            files.append((entry, rel_path))
+    return files
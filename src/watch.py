@@ -0,0 +1,128 @@
+import os
+import time
+
+from compress import MIN_SIZE, compress_tree
+from copystatic import copy_file
+from generate_page import generate_page, page_dest_path
+from inline_markdown import get_textnode_memo
+from template import Template
+from walk import scan_files
+
+
+def snapshot(root, suffix=""):
+    files = {}
+    for entry, rel_path in scan_files(root):
+        if entry.name.endswith(suffix):
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            files[rel_path] = (st.st_mtime_ns, st.st_size)
+    return files
+
+def diff_snapshots(old, new):
+    changed = [rel_path for rel_path, key in new.items() if old.get(rel_path) != key]
+    removed = [rel_path for rel_path in old if rel_path not in new]
+    return changed, removed
+
+def stat_key(path):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class Watcher:
+    def __init__(self, dir_path_content, dir_path_static, template_path, dir_path_public, base_path, copy_mode="copy", gzip_record=None, gzip_min_size=MIN_SIZE):
+        self.dir_path_content = dir_path_content
+        self.dir_path_static = dir_path_static
+        self.template_path = template_path
+        self.dir_path_public = dir_path_public
+        self.base_path = base_path
+        self.copy_mode = copy_mode
+        self.gzip_record = gzip_record
+        self.gzip_min_size = gzip_min_size
+        self.template = Template.from_file(template_path, base_path)
+        self.template_key = stat_key(template_path)
+        self.content = snapshot(dir_path_content, ".md")
+        self.static = snapshot(dir_path_static)
+
+    def poll(self):
+        start = time.perf_counter()
+        template_key = stat_key(self.template_path)
+        content = snapshot(self.dir_path_content, ".md")
+        static = snapshot(self.dir_path_static)
+        changed_pages, removed_pages = diff_snapshots(self.content, content)
+        changed_static, removed_static = diff_snapshots(self.static, static)
+
+        if template_key != self.template_key:
+            self.template = Template.from_file(self.template_path, self.base_path)
+            changed_pages = list(content)
+
+        if not (changed_pages or removed_pages or changed_static or removed_static):
+            self.template_key = template_key
+            return None
+
+        for rel_path in removed_pages:
+            _remove(page_dest_path(self.dir_path_public, rel_path))
+        for rel_path in changed_pages:
+            from_path = os.path.join(self.dir_path_content, rel_path)
+            dest_path = page_dest_path(self.dir_path_public, rel_path)
+            try:
+                generate_page(from_path, self.template_path, dest_path, self.base_path, template=self.template)
+            except Exception as e:
+                print(f"Error: Failed to generate page {from_path}: {e}")
+
+        for rel_path in removed_static:
+            _remove(os.path.join(self.dir_path_public, rel_path))
+        files = []
+        for rel_path in changed_static:
+            dest_path = os.path.join(self.dir_path_public, rel_path)
+            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+            files.append((os.path.join(self.dir_path_static, rel_path), dest_path))
+        for src_path, dest_path in files:
+            try:
+                copy_file(src_path, dest_path, self.copy_mode)
+            except FileNotFoundError:
+                print(f"Skipped {src_path}: removed before it could be copied")
+        if self.gzip_record is not None:
+            compress_tree(
+                self.dir_path_public,
+                min_size=self.gzip_min_size,
+                record=self.gzip_record,
+                static_dir=self.dir_path_static,
+            )
+
+        # Only advance the snapshots once the rebuild went through, so an
+        # OSError part way leaves the changes to be retried on the next poll.
+        self.template_key = template_key
+        self.content = content
+        self.static = static
+
+        elapsed = time.perf_counter() - start
+        print(
+            f"Rebuilt {len(changed_pages)} pages, removed {len(removed_pages)}; "
+            f"copied {len(changed_static)} static files, removed {len(removed_static)} "
+            f"in {elapsed * 1000:.1f} ms"
+        )
+        memo = get_textnode_memo()
+        if memo is not None:
+            print(memo)
+            memo.clear()
+        return elapsed
+
+    def run(self, interval=0.25):
+        print(f"Watching {self.dir_path_content}, {self.dir_path_static} and {self.template_path} for changes...")
+        try:
+            while True:
+                time.sleep(interval)
+                try:
+                    self.poll()
+                except OSError as e:
+                    print(f"Error: {e}; retrying")
+        except KeyboardInterrupt:
+            print("Stopped watching.")